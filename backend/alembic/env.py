@@ -27,6 +27,12 @@ from app.models.address import Address  # noqa: F401 – for autogenerate
 from app.models.wishlist import Wishlist  # noqa: F401 – for autogenerate
 from app.models.order import Order  # noqa: F401 – for autogenerate
 from app.models.order_item import OrderItem  # noqa: F401 – for autogenerate
+from app.models.catalog_state import CatalogState  # noqa: F401 – for autogenerate
+from app.models.idempotency_key import IdempotencyKey  # noqa: F401 – for autogenerate
+from app.models.stock_reservation import StockReservation  # noqa: F401 – for autogenerate
+from app.models.product_stock_shard import ProductStockShard  # noqa: F401 – for autogenerate
+from app.models.sales_rollup import SalesDaily  # noqa: F401 – for autogenerate
+from app.models.outbox_event import OutboxEvent  # noqa: F401 – for autogenerate
 
 # Alembic Config object
 config = context.config
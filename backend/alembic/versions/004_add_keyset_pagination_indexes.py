@@ -0,0 +1,40 @@
+"""add composite indexes for keyset pagination
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # B-tree indexes are scanned backwards for ORDER BY created_at DESC, id DESC
+    op.create_index(
+        "ix_product_active_created_at_id",
+        "product",
+        ["created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index("ix_product_created_at_id", "product", ["created_at", "id"], unique=False)
+    op.create_index(
+        "ix_order_user_id_created_at_id",
+        "order",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_user_id_created_at_id", table_name="order")
+    op.drop_index("ix_product_created_at_id", table_name="product")
+    op.drop_index("ix_product_active_created_at_id", table_name="product")
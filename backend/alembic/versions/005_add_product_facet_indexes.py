@@ -0,0 +1,26 @@
+"""add GIN indexes on product sizes and colors
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Default jsonb_ops (not jsonb_path_ops) so the ?| "any of" operator is indexable
+    op.create_index("ix_product_sizes", "product", ["sizes"], unique=False, postgresql_using="gin")
+    op.create_index("ix_product_colors", "product", ["colors"], unique=False, postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_colors", table_name="product")
+    op.drop_index("ix_product_sizes", table_name="product")
@@ -0,0 +1,49 @@
+"""add product effective_price generated column and price/discount sort indexes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Same rule as checkout: discount_price unless unset or zero, else price
+    op.add_column(
+        "product",
+        sa.Column(
+            "effective_price",
+            sa.Numeric(precision=10, scale=2),
+            sa.Computed("coalesce(nullif(discount_price, 0), price)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_product_active_effective_price_id",
+        "product",
+        ["effective_price", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "ix_product_active_discount_id",
+        "product",
+        [sa.text("(price - effective_price)"), "id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_active_discount_id", table_name="product")
+    op.drop_index("ix_product_active_effective_price_id", table_name="product")
+    op.drop_column("product", "effective_price")
@@ -0,0 +1,53 @@
+"""add denormalized product counters to category
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "category",
+        sa.Column("product_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "category",
+        sa.Column("subtree_product_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    # Backfill; afterwards maintained by the app (services/category_counts.py)
+    op.execute(
+        """
+        WITH RECURSIVE lineage(category_id, ancestor_id) AS (
+            SELECT id, id FROM category
+            UNION
+            SELECT l.category_id, c.parent_id
+            FROM lineage l JOIN category c ON c.id = l.ancestor_id
+            WHERE c.parent_id IS NOT NULL
+        ),
+        direct AS (
+            SELECT category_id, count(*) AS n FROM product WHERE is_active GROUP BY category_id
+        )
+        UPDATE category
+        SET product_count = coalesce((SELECT n FROM direct WHERE direct.category_id = category.id), 0),
+            subtree_product_count = coalesce((
+                SELECT sum(d.n) FROM lineage l JOIN direct d ON d.category_id = l.category_id
+                WHERE l.ancestor_id = category.id
+            ), 0)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("category", "subtree_product_count")
+    op.drop_column("category", "product_count")
@@ -0,0 +1,47 @@
+"""add materialized path to category
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("category", sa.Column("path", sa.String(length=255), nullable=True))
+    # "/<root id>/.../<own id>/"; afterwards maintained by the app (services/category_paths.py)
+    op.execute(
+        """
+        WITH RECURSIVE tree(id, path) AS (
+            SELECT id, '/' || id || '/' FROM category WHERE parent_id IS NULL
+            UNION ALL
+            SELECT c.id, tree.path || c.id || '/'
+            FROM category c JOIN tree ON c.parent_id = tree.id
+        )
+        UPDATE category SET path = tree.path FROM tree WHERE category.id = tree.id
+        """
+    )
+    # Categories caught in a parent cycle are unreachable from a root: make them roots
+    op.execute("UPDATE category SET parent_id = NULL, path = '/' || id || '/' WHERE path IS NULL")
+    op.alter_column("category", "path", nullable=False)
+    op.create_index(
+        "ix_category_path",
+        "category",
+        ["path"],
+        unique=False,
+        postgresql_ops={"path": "varchar_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_category_path", table_name="category")
+    op.drop_column("category", "path")
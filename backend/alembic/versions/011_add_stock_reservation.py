@@ -0,0 +1,53 @@
+"""add stock_reservation table (time-limited cart holds)
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stock_reservation",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["product_id"], ["product.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "product_id", name="uq_stock_reservation_user_product"),
+    )
+    op.create_index(
+        "ix_stock_reservation_product_expires",
+        "stock_reservation",
+        ["product_id", "expires_at"],
+        unique=False,
+        postgresql_include=["quantity", "user_id"],
+    )
+    op.create_index(
+        "ix_stock_reservation_expires_at", "stock_reservation", ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_reservation_expires_at", table_name="stock_reservation")
+    op.drop_index("ix_stock_reservation_product_expires", table_name="stock_reservation")
+    op.drop_table("stock_reservation")
@@ -0,0 +1,45 @@
+"""add sharded stock counters (product.stock_sharded, product_stock_shard)
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "product",
+        sa.Column("stock_sharded", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+    )
+    op.create_table(
+        "product_stock_shard",
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("shard", sa.Integer(), nullable=False),
+        sa.Column("stock", sa.Integer(), nullable=False),
+        sa.CheckConstraint("stock >= 0", name="ck_product_stock_shard_stock"),
+        sa.ForeignKeyConstraint(["product_id"], ["product.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("product_id", "shard"),
+    )
+
+
+def downgrade() -> None:
+    # Fold shards back into product.stock before dropping them
+    op.execute(
+        """
+        UPDATE product SET stock = s.total
+        FROM (SELECT product_id, sum(stock) AS total FROM product_stock_shard GROUP BY product_id) s
+        WHERE product.id = s.product_id
+        """
+    )
+    op.drop_table("product_stock_shard")
+    op.drop_column("product", "stock_sharded")
@@ -0,0 +1,56 @@
+"""snapshot product name, slug and image onto order_item
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# order_item rows backfilled per committed batch
+BACKFILL_BATCH = 5000
+
+_BACKFILL = """
+    UPDATE order_item oi
+    SET product_name = p.name,
+        product_slug = p.slug,
+        product_image = p.images ->> 0
+    FROM product p
+    WHERE p.id = oi.product_id AND oi.product_name IS NULL{range}
+"""
+
+
+def upgrade() -> None:
+    op.add_column("order_item", sa.Column("product_name", sa.String(200), nullable=True))
+    op.add_column("order_item", sa.Column("product_slug", sa.String(250), nullable=True))
+    op.add_column("order_item", sa.Column("product_image", sa.Text(), nullable=True))
+
+    # Backfill in id ranges, each committed on its own, so no batch holds row locks for long
+    with op.get_context().autocommit_block():
+        if context.is_offline_mode():
+            op.execute(_BACKFILL.format(range=""))
+        else:
+            bind = op.get_bind()
+            max_id = bind.execute(sa.text("SELECT coalesce(max(id), 0) FROM order_item")).scalar()
+            for start in range(0, max_id, BACKFILL_BATCH):
+                bind.execute(
+                    sa.text(_BACKFILL.format(range=" AND oi.id > :start AND oi.id <= :end")),
+                    {"start": start, "end": start + BACKFILL_BATCH},
+                )
+
+    op.alter_column("order_item", "product_name", nullable=False)
+    op.alter_column("order_item", "product_slug", nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column("order_item", "product_image")
+    op.drop_column("order_item", "product_slug")
+    op.drop_column("order_item", "product_name")
@@ -0,0 +1,60 @@
+"""copy the order's created_at onto order_item
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-17
+
+order_item.order_created_at is the partition key of a partitioned order_item
+(migration 015) and the second half of its foreign key to "order".
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# order_item rows backfilled per committed batch
+BACKFILL_BATCH = 5000
+
+_BACKFILL = """
+    UPDATE order_item oi
+    SET order_created_at = o.created_at
+    FROM "order" o
+    WHERE o.id = oi.order_id AND oi.order_created_at IS NULL{range}
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "order_item",
+        sa.Column("order_created_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # Backfill in id ranges, each committed on its own, so no batch holds row locks for long
+    with op.get_context().autocommit_block():
+        if context.is_offline_mode():
+            op.execute(_BACKFILL.format(range=""))
+        else:
+            bind = op.get_bind()
+            max_id = bind.execute(sa.text("SELECT coalesce(max(id), 0) FROM order_item")).scalar()
+            for start in range(0, max_id, BACKFILL_BATCH):
+                bind.execute(
+                    sa.text(_BACKFILL.format(range=" AND oi.id > :start AND oi.id <= :end")),
+                    {"start": start, "end": start + BACKFILL_BATCH},
+                )
+
+    # now() is the transaction start time, so items inserted with their order match it
+    op.alter_column(
+        "order_item",
+        "order_created_at",
+        server_default=sa.text("now()"),
+        nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("order_item", "order_created_at")
@@ -0,0 +1,179 @@
+"""range-partition order and order_item by month (when ORDER_PARTITIONING is set)
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-17
+
+Optional: a no-op unless ORDER_PARTITIONING is true when it runs. To switch an
+existing database over later, stop the API and run
+`python scripts/order_partitions.py partition` (re-runnable; no downgrade needed).
+
+"order" is partitioned by created_at and order_item by order_created_at, one
+partition per UTC month (order_pYYYYMM, order_item_pYYYYMM) from the oldest order
+to ORDER_PARTITION_MONTHS_AHEAD months ahead; app/services/order_partitions.py
+maintains the partitions afterwards. The conversion is a frozen copy of the one in
+that module, so later changes there don't alter what this revision does. Primary keys become
+(id, created_at) and (id, order_created_at), as Postgres requires the partition
+key in unique constraints, and order_item references "order" on
+(order_id, order_created_at). Downgrade turns partitioned tables back into plain ones.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.config import settings
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows copied per committed batch
+CONVERT_BATCH = 5000
+
+# pg_advisory_lock key shared with app/services/order_partitions.py
+_LOCK_KEY = 0x6F72646572
+
+_IS_PARTITIONED = (
+    "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('\"order\"'))"
+)
+
+
+def _swap_tables_sql(partitioned: bool, months_ahead: int) -> str:
+    """Atomic DO block: move order/order_item aside as *_legacy and create the new (empty) tables."""
+    order_key, item_key, item_fk = (
+        ("id, created_at", "id, order_created_at", "(order_id, order_created_at) REFERENCES \"order\" (id, created_at)")
+        if partitioned
+        else ("id", "id", "(order_id) REFERENCES \"order\" (id)")
+    )
+    order_partition_by = " PARTITION BY RANGE (created_at)" if partitioned else ""
+    item_partition_by = " PARTITION BY RANGE (order_created_at)" if partitioned else ""
+    partitions = f"""
+        month := date_trunc('month', coalesce((SELECT min(created_at) FROM order_legacy), now()) AT TIME ZONE 'UTC');
+        last_month := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{int(months_ahead)} months';
+        WHILE month <= last_month LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF "order" FOR VALUES FROM (%L) TO (%L)',
+                'order_p' || to_char(month, 'YYYYMM'),
+                month || ' 00:00+00',
+                (month + interval '1 month')::date || ' 00:00+00'
+            );
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF order_item FOR VALUES FROM (%L) TO (%L)',
+                'order_item_p' || to_char(month, 'YYYYMM'),
+                month || ' 00:00+00',
+                (month + interval '1 month')::date || ' 00:00+00'
+            );
+            month := month + interval '1 month';
+        END LOOP;
+    """ if partitioned else ""
+    return f"""
+    DO $convert$
+    DECLARE
+        tables regclass[] := ARRAY[to_regclass('"order"'), to_regclass('order_item')];
+        definitions text[];
+        definition text;
+        index_name name;
+        month date;
+        last_month date;
+    BEGIN
+        -- Secondary indexes and foreign keys (other than order_item -> "order") to recreate
+        definitions := ARRAY(
+            SELECT replace(pg_get_indexdef(indexrelid), ' ON ONLY ', ' ON ') FROM pg_index
+            WHERE indrelid = ANY (tables) AND NOT indisprimary
+            UNION ALL
+            SELECT format('ALTER TABLE %s ADD CONSTRAINT %I %s', conrelid::regclass, conname, pg_get_constraintdef(oid))
+            FROM pg_constraint
+            WHERE conrelid = ANY (tables) AND contype = 'f' AND confrelid <> tables[1] AND conparentid = 0
+        );
+        -- Index names are schema-wide: move the legacy ones out of the way
+        FOR index_name IN
+            SELECT c.relname FROM pg_index x JOIN pg_class c ON c.oid = x.indexrelid
+            WHERE x.indrelid = ANY (tables)
+        LOOP
+            EXECUTE format('ALTER INDEX %I RENAME TO %I', index_name, index_name || '_legacy');
+        END LOOP;
+        ALTER TABLE order_item RENAME TO order_item_legacy;
+        ALTER TABLE "order" RENAME TO order_legacy;
+
+        CREATE TABLE "order" (LIKE order_legacy INCLUDING DEFAULTS){order_partition_by};
+        ALTER TABLE "order" ADD CONSTRAINT order_pkey PRIMARY KEY ({order_key});
+        CREATE TABLE order_item (LIKE order_item_legacy INCLUDING DEFAULTS){item_partition_by};
+        ALTER TABLE order_item ADD CONSTRAINT order_item_pkey PRIMARY KEY ({item_key});
+        ALTER TABLE order_item ADD CONSTRAINT order_item_order_id_fkey
+            FOREIGN KEY {item_fk} ON DELETE CASCADE;
+        {partitions}
+        FOREACH definition IN ARRAY definitions LOOP
+            EXECUTE definition;
+        END LOOP;
+    END $convert$
+    """
+
+
+def _copy_rows_sql(table: str) -> str:
+    return f'INSERT INTO "{table}" SELECT * FROM {table}_legacy'
+
+
+# Checks every row arrived, hands the id sequences to the new tables and drops the legacy ones
+_FINISH_SQL = """
+    DO $convert$
+    BEGIN
+        IF (SELECT count(*) FROM order_legacy) <> (SELECT count(*) FROM "order")
+           OR (SELECT count(*) FROM order_item_legacy) <> (SELECT count(*) FROM order_item) THEN
+            RAISE EXCEPTION 'order tables conversion: row counts differ, legacy tables kept';
+        END IF;
+        EXECUTE format('ALTER SEQUENCE %s OWNED BY "order".id', pg_get_serial_sequence('order_legacy', 'id'));
+        EXECUTE format(
+            'ALTER SEQUENCE %s OWNED BY order_item.id', pg_get_serial_sequence('order_item_legacy', 'id')
+        );
+        DROP TABLE order_item_legacy;
+        DROP TABLE order_legacy;
+    END $convert$
+"""
+
+
+def _convert_online(partitioned: bool) -> None:
+    # Resumable like scripts/order_partitions.py: the swap is atomic, the copy resumes after the last id
+    bind = op.get_bind()
+    bind.execute(sa.text("SELECT pg_advisory_lock(:key)"), {"key": _LOCK_KEY})
+    try:
+        swapped = bind.execute(sa.text("SELECT to_regclass('order_legacy') IS NOT NULL")).scalar_one()
+        if not swapped:
+            if bind.execute(sa.text(_IS_PARTITIONED)).scalar_one() == partitioned:
+                return
+            bind.execute(sa.text(_swap_tables_sql(partitioned, settings.ORDER_PARTITION_MONTHS_AHEAD)))
+        # Orders first: the new order_item foreign key checks each copied row
+        for table in ("order", "order_item"):
+            copy = sa.text(f"{_copy_rows_sql(table)} WHERE id > :start AND id <= :end")
+            done = bind.execute(sa.text(f'SELECT coalesce(max(id), 0) FROM "{table}"')).scalar_one()
+            last = bind.execute(sa.text(f"SELECT coalesce(max(id), 0) FROM {table}_legacy")).scalar_one()
+            for start in range(done, last, CONVERT_BATCH):
+                bind.execute(copy, {"start": start, "end": start + CONVERT_BATCH})
+        bind.execute(sa.text(_FINISH_SQL))
+    finally:
+        bind.execute(sa.text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
+
+
+def _convert(partitioned: bool) -> None:
+    if context.is_offline_mode():
+        # No catalog to inspect: emit the whole conversion, each table copied in one statement
+        op.execute(_swap_tables_sql(partitioned, settings.ORDER_PARTITION_MONTHS_AHEAD))
+        op.execute(_copy_rows_sql("order"))
+        op.execute(_copy_rows_sql("order_item"))
+        op.execute(_FINISH_SQL)
+        return
+    with op.get_context().autocommit_block():
+        _convert_online(partitioned)
+
+
+def upgrade() -> None:
+    if settings.ORDER_PARTITIONING:
+        _convert(partitioned=True)
+
+
+def downgrade() -> None:
+    # Offline there is no catalog to ask; assume the flag matches the database.
+    # Online, the conversion is a no-op on tables that are already plain.
+    if settings.ORDER_PARTITIONING or not context.is_offline_mode():
+        _convert(partitioned=False)
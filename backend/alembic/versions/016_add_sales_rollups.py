@@ -0,0 +1,72 @@
+"""add daily sales rollup tables and an order created_at index
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _totals() -> list[sa.Column]:
+    return [
+        sa.Column("revenue", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("units", sa.Integer(), nullable=False),
+        sa.Column("orders", sa.Integer(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    # Rollup refresh scans orders by created_at window (and prunes partitions, if any)
+    op.create_index("ix_order_created_at", "order", ["created_at"], unique=False)
+
+    op.create_table(
+        "sales_rollup_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO sales_rollup_state (id) VALUES (1)")
+    op.create_table(
+        "sales_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        *_totals(),
+        sa.PrimaryKeyConstraint("day"),
+    )
+    op.create_table(
+        "sales_daily_category",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        *_totals(),
+        sa.PrimaryKeyConstraint("day", "category_id"),
+    )
+    op.create_table(
+        "sales_daily_product",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        *_totals(),
+        sa.PrimaryKeyConstraint("day", "product_id"),
+    )
+    op.create_index(
+        "ix_sales_daily_product_product_day",
+        "sales_daily_product",
+        ["product_id", "day"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sales_daily_product_product_day", table_name="sales_daily_product")
+    op.drop_table("sales_daily_product")
+    op.drop_table("sales_daily_category")
+    op.drop_table("sales_daily")
+    op.drop_table("sales_rollup_state")
+    op.drop_index("ix_order_created_at", table_name="order")
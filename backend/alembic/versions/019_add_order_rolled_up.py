@@ -0,0 +1,78 @@
+"""track sales rollup progress per order (order.rolled_up) instead of a time watermark
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-17
+
+Orders created before the old watermark count as folded in. Orders that committed
+more than SALES_ROLLUP_LAG_SECONDS after they started may have been missed by the
+watermark; scripts/rebuild_sales_rollups.py recounts them.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision: str = "019"
+down_revision: Union[str, None] = "018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# "order" rows backfilled per committed batch
+BACKFILL_BATCH = 5000
+
+_BACKFILL = """
+    UPDATE "order" SET rolled_up = false
+    WHERE created_at >= coalesce((SELECT watermark FROM sales_rollup_state WHERE id = 1), '-infinity'){range}
+"""
+
+
+def upgrade() -> None:
+    # Existing rows get true without a table rewrite; new orders default to false
+    op.add_column(
+        "order",
+        sa.Column("rolled_up", sa.Boolean(), server_default=sa.text("true"), nullable=False),
+    )
+    op.alter_column("order", "rolled_up", server_default=sa.text("false"))
+
+    # Backfill in id ranges, each committed on its own, so no batch holds row locks for long
+    with op.get_context().autocommit_block():
+        if context.is_offline_mode():
+            op.execute(_BACKFILL.format(range=""))
+        else:
+            bind = op.get_bind()
+            max_id = bind.execute(sa.text('SELECT coalesce(max(id), 0) FROM "order"')).scalar()
+            for start in range(0, max_id, BACKFILL_BATCH):
+                bind.execute(
+                    sa.text(_BACKFILL.format(range=" AND id > :start AND id <= :end")),
+                    {"start": start, "end": start + BACKFILL_BATCH},
+                )
+
+    op.create_index(
+        "ix_order_pending_rollup",
+        "order",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("NOT rolled_up"),
+    )
+    op.drop_index("ix_order_created_at", table_name="order")
+    op.drop_column("sales_rollup_state", "watermark")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "sales_rollup_state",
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE sales_rollup_state SET watermark = coalesce(
+            (SELECT min(created_at) FROM "order" WHERE NOT rolled_up),
+            (SELECT max(created_at) FROM "order")
+        )
+        WHERE id = 1
+        """
+    )
+    op.create_index("ix_order_created_at", "order", ["created_at"], unique=False)
+    op.drop_index("ix_order_pending_rollup", table_name="order")
+    op.drop_column("order", "rolled_up")
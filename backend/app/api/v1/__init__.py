@@ -1,4 +1,4 @@
-# API v1: auth, users, categories, products, admin, addresses, wishlist, orders.
+# API v1: auth, users, categories, products, admin, addresses, wishlist, orders, reservations.
 
 from app.api.v1.admin import admin_router
 from app.api.v1.auth import router as auth_router
@@ -8,6 +8,7 @@ from app.api.v1.users import router as users_router
 from app.api.v1.addresses import router as addresses_router
 from app.api.v1.wishlist import router as wishlist_router
 from app.api.v1.orders import router as orders_router
+from app.api.v1.reservations import router as reservations_router
 from app.api.v1.ai import router as ai_router
 
 __all__ = [
@@ -19,5 +20,6 @@ __all__ = [
     "addresses_router",
     "wishlist_router",
     "orders_router",
+    "reservations_router",
     "ai_router",
 ]
@@ -0,0 +1,20 @@
+"""
+Admin cache API – in-process cache stats (superuser only).
+"""
+
+from fastapi import APIRouter, Depends
+
+from app.auth.backend import current_superuser
+from app.models.user import User
+from app.schemas.cache import CacheStats
+from app.services.cache import caches
+
+router = APIRouter(prefix="/cache", tags=["admin", "cache"])
+
+
+@router.get("/stats", response_model=dict[str, CacheStats])
+async def get_cache_stats(
+    user: User = Depends(current_superuser),
+) -> dict[str, CacheStats]:
+    """Hit/miss/eviction counters for every named cache in this worker process."""
+    return {name: CacheStats(**cache.stats()) for name, cache in caches.items()}
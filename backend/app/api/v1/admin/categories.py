@@ -12,6 +12,11 @@ from app.database import get_db
 from app.models.category import Category
 from app.models.user import User
 from app.schemas.category import CategoryCreate, CategoryRead, CategoryUpdate
+from app.services.catalog_cache import invalidate_categories
+from app.services.category_counts import recompute_category_counts
+from app.services.category_paths import assign_path, detach_children, move_category
+from app.services.http_cache import bump_catalog_version
+from app.services.suggest import category_suggestion, suggest_index
 
 router = APIRouter(prefix="/categories", tags=["admin", "categories"])
 
@@ -27,9 +32,13 @@ async def create_category(
     if result.scalar_one_or_none():
         raise HTTPException(status_code=400, detail="Category with this slug already exists")
     category = Category(**body.model_dump())
+    await assign_path(db, category)
     db.add(category)
+    await bump_catalog_version(db)
     await db.commit()
+    invalidate_categories()
     await db.refresh(category)
+    suggest_index.upsert(category_suggestion(category))
     return CategoryRead.model_validate(category)
 
 
@@ -71,10 +80,20 @@ async def update_category_admin(
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     data = body.model_dump(exclude_unset=True)
+    parent_id = data.pop("parent_id", category.parent_id)
+    moved = parent_id != category.parent_id
     for key, value in data.items():
         setattr(category, key, value)
+    if moved:
+        await move_category(db, category, parent_id)
+        # Subtree totals of the old and new ancestors change
+        await db.flush()
+        await recompute_category_counts(db)
+    await bump_catalog_version(db)
     await db.commit()
+    invalidate_categories()
     await db.refresh(category)
+    suggest_index.upsert(category_suggestion(category))
     return CategoryRead.model_validate(category)
 
 
@@ -89,6 +108,13 @@ async def delete_category_admin(
     category = result.scalar_one_or_none()
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
+    await detach_children(db, category)
     await db.delete(category)
+    await db.flush()
+    # Children are detached (parent_id SET NULL), so ancestor subtree totals shrink
+    await recompute_category_counts(db)
+    await bump_catalog_version(db)
     await db.commit()
+    invalidate_categories()
+    suggest_index.remove("category", category.id)
     return None
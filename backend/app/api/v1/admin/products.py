@@ -4,7 +4,7 @@ Admin products API – full CRUD (superuser only).
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -12,10 +12,38 @@ from app.auth.backend import current_superuser
 from app.database import get_db
 from app.models.product import Product
 from app.models.user import User
-from app.schemas.product import ProductCreate, ProductListResponse, ProductRead, ProductUpdate
+from app.schemas.product import (
+    ProductCreate,
+    ProductListResponse,
+    ProductRead,
+    ProductStockShardsUpdate,
+    ProductUpdate,
+)
+from app.services.catalog_cache import invalidate_product
+from app.services.category_counts import update_category_counts
+from app.services.counting import CountMode, TotalCounter, filter_signature
+from app.services.http_cache import bump_catalog_version
+from app.services.pagination import Keyset
+from app.services.stock_shards import disable_sharding, enable_sharding, set_sharded_stock
+from app.services.suggest import index_product, suggest_index
 
 router = APIRouter(prefix="/products", tags=["admin", "products"])
 
+# Newest first; backed by ix_product_created_at_id
+_NEWEST = Keyset("newest", Product.created_at, Product.id)
+
+
+async def _load_product(db: AsyncSession, id: int) -> Product | None:
+    """Product with its category, re-reading columns Postgres generates (effective_price)."""
+    q = (
+        select(Product)
+        .where(Product.id == id)
+        .options(selectinload(Product.category))
+        .execution_options(populate_existing=True)
+    )
+    result = await db.execute(q)
+    return result.unique().scalar_one_or_none()
+
 
 @router.post("/", response_model=ProductRead, status_code=201)
 async def create_product(
@@ -29,30 +57,47 @@ async def create_product(
         raise HTTPException(status_code=400, detail="Product with this slug already exists")
     product = Product(**body.model_dump())
     db.add(product)
+    await update_category_counts(db, None, (product.category_id, product.is_active))
+    await bump_catalog_version(db)
     await db.commit()
-    await db.refresh(product)
-    return ProductRead.model_validate(product)
+    invalidate_product(product.slug)
+    index_product(product)
+    return ProductRead.model_validate(await _load_product(db, product.id))
 
 
 @router.get("/", response_model=ProductListResponse)
 async def list_products_admin(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from a previous page; overrides page"),
+    count: CountMode = Query(
+        "exact", description="How to compute total: exact, cached, estimated or none"
+    ),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(current_superuser),
 ) -> ProductListResponse:
     """List all products with pagination (superuser only)."""
-    q = select(Product).order_by(Product.created_at.desc())
-    total_result = await db.execute(select(func.count()).select_from(q.subquery()))
-    total = total_result.scalar() or 0
-    q = q.offset((page - 1) * size).limit(size).options(selectinload(Product.category))
-    result = await db.execute(q)
-    products = list(result.unique().scalars().all())
+    base_q = select(Product)
+    counter = TotalCounter(
+        count,
+        "product",
+        filter_signature(include_inactive=True),
+        first_page=page == 1 and not cursor,
+        cursor=cursor is not None,
+        estimate_relation="product",
+    )
+    q = base_q.add_columns(*_NEWEST.key_columns()).order_by(*_NEWEST.order_by()).limit(size + 1)
+    q = q.where(_NEWEST.after(cursor)) if cursor else q.offset((page - 1) * size)
+    result = await db.execute(counter.apply(q).options(selectinload(Product.category)))
+    rows = result.all()
+    total = await counter.total(db, base_q, rows)
+    rows, next_cursor = _NEWEST.page(rows, size)
     return ProductListResponse(
         total=total,
-        items=[ProductRead.model_validate(p) for p in products],
+        items=[ProductRead.model_validate(row[0]) for row in rows],
         page=page,
         size=size,
+        next_cursor=next_cursor,
     )
 
 
@@ -63,9 +108,7 @@ async def get_product_admin(
     user: User = Depends(current_superuser),
 ) -> ProductRead:
     """Get a product by id (superuser only)."""
-    q = select(Product).where(Product.id == id).options(selectinload(Product.category))
-    result = await db.execute(q)
-    product = result.unique().scalar_one_or_none()
+    product = await _load_product(db, id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return ProductRead.model_validate(product)
@@ -79,16 +122,63 @@ async def update_product_admin(
     user: User = Depends(current_superuser),
 ) -> ProductRead:
     """Update a product (superuser only)."""
-    result = await db.execute(select(Product).where(Product.id == id))
+    result = await db.execute(select(Product).where(Product.id == id).with_for_update())
     product = result.scalar_one_or_none()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
+    old_slug = product.slug
+    before = (product.category_id, product.is_active)
     data = body.model_dump(exclude_unset=True)
+    if product.stock_sharded and data.get("stock") is not None:
+        await set_sharded_stock(db, product, data.pop("stock"))
     for key, value in data.items():
         setattr(product, key, value)
+    await update_category_counts(db, before, (product.category_id, product.is_active))
+    await bump_catalog_version(db)
     await db.commit()
-    await db.refresh(product)
-    return ProductRead.model_validate(product)
+    invalidate_product(old_slug, product.slug)
+    index_product(product)
+    return ProductRead.model_validate(await _load_product(db, product.id))
+
+
+@router.post("/{id}/stock-shards", response_model=ProductRead)
+async def shard_product_stock(
+    id: int,
+    body: ProductStockShardsUpdate,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_superuser),
+) -> ProductRead:
+    """Split a product's stock across shard rows for flash sales (superuser only).
+
+    Checkouts then decrement a random shard instead of contending on the product row.
+    """
+    result = await db.execute(select(Product).where(Product.id == id).with_for_update())
+    product = result.scalar_one_or_none()
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    await enable_sharding(db, product, body.shards)
+    await bump_catalog_version(db)
+    await db.commit()
+    invalidate_product(product.slug)
+    return ProductRead.model_validate(await _load_product(db, product.id))
+
+
+@router.delete("/{id}/stock-shards", response_model=ProductRead)
+async def unshard_product_stock(
+    id: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_superuser),
+) -> ProductRead:
+    """Fold a sharded product's stock back into product.stock (superuser only)."""
+    result = await db.execute(select(Product).where(Product.id == id).with_for_update())
+    product = result.scalar_one_or_none()
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    await disable_sharding(db, product)
+    await bump_catalog_version(db)
+    await db.commit()
+    invalidate_product(product.slug)
+    return ProductRead.model_validate(await _load_product(db, product.id))
 
 
 @router.delete("/{id}", status_code=204)
@@ -98,10 +188,14 @@ async def delete_product_admin(
     user: User = Depends(current_superuser),
 ) -> None:
     """Delete a product (superuser only)."""
-    result = await db.execute(select(Product).where(Product.id == id))
+    result = await db.execute(select(Product).where(Product.id == id).with_for_update())
     product = result.scalar_one_or_none()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     await db.delete(product)
+    await update_category_counts(db, (product.category_id, product.is_active), None)
+    await bump_catalog_version(db)
     await db.commit()
+    invalidate_product(product.slug)
+    suggest_index.remove("product", product.id)
     return None
@@ -0,0 +1,129 @@
+"""
+Admin reports API – sales by day, category and product, and top sellers (superuser only).
+
+Served from the daily rollup tables (services/sales_rollups.py), so the cost
+depends on the length of the range, not on order history. Figures trail live
+orders by up to SALES_ROLLUP_REFRESH_SECONDS. Days are UTC; days without sales
+are omitted.
+"""
+
+from datetime import UTC, date, datetime, timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.backend import current_superuser
+from app.config import settings
+from app.database import get_db
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sales_rollup import SalesDaily, SalesDailyCategory, SalesDailyProduct
+from app.models.user import User
+from app.schemas.report import CategorySales, DailySales, ProductSales
+
+router = APIRouter(prefix="/reports", tags=["admin", "reports"])
+
+# Days covered when the client gives no start
+DEFAULT_RANGE_DAYS = 30
+
+
+def report_range(
+    start: date | None = Query(None, description=f"First UTC day; default {DEFAULT_RANGE_DAYS} days before end"),
+    end: date | None = Query(None, description="Last UTC day (inclusive); default today"),
+) -> tuple[date, date]:
+    """Inclusive (start, end) days; 400 if reversed or longer than SALES_REPORT_MAX_DAYS."""
+    end = end or datetime.now(UTC).date()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days + 1 > settings.SALES_REPORT_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range is limited to {settings.SALES_REPORT_MAX_DAYS} days",
+        )
+    return start, end
+
+
+def _totals(model) -> tuple:
+    return (
+        func.sum(model.revenue).label("revenue"),
+        func.sum(model.units).label("units"),
+        func.sum(model.orders).label("orders"),
+    )
+
+
+@router.get("/sales/daily", response_model=list[DailySales])
+async def get_daily_sales(
+    days: tuple[date, date] = Depends(report_range),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_superuser),
+) -> list[DailySales]:
+    """Store-wide revenue, units and orders per day."""
+    result = await db.execute(
+        select(SalesDaily).where(SalesDaily.day.between(*days)).order_by(SalesDaily.day)
+    )
+    return [DailySales.model_validate(row) for row in result.scalars().all()]
+
+
+@router.get("/sales/categories", response_model=list[CategorySales])
+async def get_category_sales(
+    days: tuple[date, date] = Depends(report_range),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_superuser),
+) -> list[CategorySales]:
+    """Revenue, units and orders per category over the range, highest revenue first."""
+    totals = (
+        select(SalesDailyCategory.category_id, *_totals(SalesDailyCategory))
+        .where(SalesDailyCategory.day.between(*days))
+        .group_by(SalesDailyCategory.category_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(totals, Category.name.label("category_name"))
+        .outerjoin(Category, Category.id == totals.c.category_id)
+        .order_by(totals.c.revenue.desc(), totals.c.category_id)
+    )
+    return [CategorySales.model_validate(row) for row in result.all()]
+
+
+@router.get("/sales/products/{product_id}", response_model=list[DailySales])
+async def get_product_sales(
+    product_id: int,
+    days: tuple[date, date] = Depends(report_range),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_superuser),
+) -> list[DailySales]:
+    """Revenue, units and orders per day for one product."""
+    result = await db.execute(
+        select(SalesDailyProduct)
+        .where(SalesDailyProduct.product_id == product_id, SalesDailyProduct.day.between(*days))
+        .order_by(SalesDailyProduct.day)
+    )
+    return [DailySales.model_validate(row) for row in result.scalars().all()]
+
+
+@router.get("/top-sellers", response_model=list[ProductSales])
+async def get_top_sellers(
+    days: tuple[date, date] = Depends(report_range),
+    by: Literal["revenue", "units"] = Query("revenue"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_superuser),
+) -> list[ProductSales]:
+    """Best-selling products over the range, by revenue or units."""
+    totals = (
+        select(SalesDailyProduct.product_id, *_totals(SalesDailyProduct))
+        .where(SalesDailyProduct.day.between(*days))
+        .group_by(SalesDailyProduct.product_id)
+        .order_by(func.sum(getattr(SalesDailyProduct, by)).desc(), SalesDailyProduct.product_id)
+        .limit(limit)
+        .subquery()
+    )
+    result = await db.execute(
+        select(totals, Product.name.label("product_name"), Product.slug.label("product_slug"))
+        .outerjoin(Product, Product.id == totals.c.product_id)
+        .order_by(totals.c[by].desc(), totals.c.product_id)
+    )
+    return [ProductSales.model_validate(row) for row in result.all()]
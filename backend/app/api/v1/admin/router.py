@@ -1,14 +1,18 @@
 """
-Admin API router – aggregates admin categories and products.
+Admin API router – aggregates admin categories, products, sales reports and cache stats.
 Mount under /api/v1 so paths are /api/v1/admin/categories, /api/v1/admin/products.
 """
 
 from fastapi import APIRouter
 
+from app.api.v1.admin.cache import router as cache_router
 from app.api.v1.admin.categories import router as categories_router
 from app.api.v1.admin.products import router as products_router
+from app.api.v1.admin.reports import router as reports_router
 
 # Prefix /admin so final paths are /api/v1/admin/categories, /api/v1/admin/products
 router = APIRouter(prefix="/admin")
 router.include_router(categories_router)
 router.include_router(products_router)
+router.include_router(reports_router)
+router.include_router(cache_router)
@@ -1,53 +1,103 @@
 """
-Public categories API – list all (optional parent_id filter), get by slug.
+Public categories API – list all (optional parent_id filter), full tree, get by slug.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.category import Category
-from app.schemas.category import CategoryListResponse, CategoryRead, CategoryReadWithCount
+from app.schemas.category import (
+    CategoryListResponse,
+    CategoryRead,
+    CategoryReadWithCount,
+    CategoryTreeNode,
+)
+from app.services.catalog_cache import category_cache
+from app.services.category_tree import load_category_tree
+from app.services.http_cache import catalog_etag, conditional_get, get_catalog_version
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
 
 @router.get("/", response_model=CategoryListResponse)
 async def list_categories(
+    request: Request,
+    response: Response,
     parent_id: int | None = Query(None, description="Filter by parent category id"),
     db: AsyncSession = Depends(get_db),
-) -> CategoryListResponse:
-    """List all categories, optionally filtered by parent_id (None = root)."""
-    q = select(Category).order_by(Category.name)
-    if parent_id is not None:
-        q = q.where(Category.parent_id == parent_id)
-    result = await db.execute(q)
-    items = list(result.scalars().all())
+) -> CategoryListResponse | Response:
+    """List all categories, optionally filtered by parent_id (None = root). Served from the read cache.
+
+    Supports conditional GET (304) against the catalog version.
+    """
+    version, last_modified = await get_catalog_version(db)
+    not_modified = conditional_get(request, response, catalog_etag(request, version), last_modified)
+    if not_modified:
+        return not_modified
+
+    async def load() -> list[CategoryRead]:
+        q = select(Category).order_by(Category.name)
+        if parent_id is not None:
+            q = q.where(Category.parent_id == parent_id)
+        result = await db.execute(q)
+        return [CategoryRead.model_validate(c) for c in result.scalars().all()]
+
+    items = await category_cache.get_or_load(("list", parent_id, version), load)
     return CategoryListResponse(
         total=len(items),
-        items=[CategoryRead.model_validate(c) for c in items],
+        items=items,
         page=1,
         size=len(items),
     )
 
 
+@router.get("/tree", response_model=list[CategoryTreeNode])
+async def get_category_tree(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+) -> list[CategoryTreeNode] | Response:
+    """Whole category hierarchy with per-node product counts (one recursive query, cached).
+
+    Cached until the next category or product write; supports conditional GET (304).
+    """
+    version, last_modified = await get_catalog_version(db)
+    not_modified = conditional_get(request, response, catalog_etag(request, version), last_modified)
+    if not_modified:
+        return not_modified
+    return await category_cache.get_or_load(("tree", version), lambda: load_category_tree(db))
+
+
 @router.get("/{slug}", response_model=CategoryReadWithCount)
 async def get_category_by_slug(
     slug: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-) -> CategoryReadWithCount:
-    """Get a category by slug; includes product count."""
-    result = await db.execute(select(Category).where(Category.slug == slug))
-    category = result.scalar_one_or_none()
+) -> CategoryReadWithCount | Response:
+    """Get a category by slug; includes active product counts (maintained columns). Served from the read cache.
+
+    Validated by the catalog version, since product writes change the count.
+    """
+    version, last_modified = await get_catalog_version(db)
+    not_modified = conditional_get(request, response, catalog_etag(request, version), last_modified)
+    if not_modified:
+        return not_modified
+
+    async def load() -> CategoryReadWithCount | None:
+        result = await db.execute(select(Category).where(Category.slug == slug))
+        category = result.scalar_one_or_none()
+        if not category:
+            return None
+        return CategoryReadWithCount(
+            **CategoryRead.model_validate(category).model_dump(),
+            products_count=category.product_count,
+            subtree_products_count=category.subtree_product_count,
+        )
+
+    category = await category_cache.get_or_load(("slug", slug, version), load)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
-    from app.models.product import Product
-    count_result = await db.execute(
-        select(func.count()).select_from(Product).where(Product.category_id == category.id)
-    )
-    products_count = count_result.scalar() or 0
-    return CategoryReadWithCount(
-        **CategoryRead.model_validate(category).model_dump(),
-        products_count=products_count,
-    )
\ No newline at end of file
+    return category
@@ -3,32 +3,49 @@ Orders API – create order (from cart), list orders, order detail.
 All endpoints require authentication.
 """
 
-from decimal import Decimal
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.auth import current_active_user
 from app.database import get_db
-from app.models.address import Address
 from app.models.order import Order
 from app.models.order_item import OrderItem
-from app.models.product import Product
 from app.models.user import User
 from app.schemas.order import (
     OrderCreate,
     OrderItemRead,
     OrderListResponse,
     OrderRead,
+    OrderSummary,
 )
+from app.services.counting import CountMode, TotalCounter, filter_signature, invalidate_counts
+from app.services.checkout import place_order
+from app.services.http_cache import bump_stock_version
+from app.services.idempotency import (
+    IDEMPOTENCY_HEADER,
+    claim_key,
+    request_fingerprint,
+    store_response,
+)
+from app.services.outbox import enqueue_event
+from app.services.outbox_handlers import ORDER_PLACED
+from app.services.pagination import Keyset
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
+# Newest first; backed by ix_order_user_id_created_at_id
+_NEWEST = Keyset("newest", Order.created_at, Order.id)
+
 
 def _order_item_to_read(oi: OrderItem) -> OrderItemRead:
-    """Convert OrderItem ORM to OrderItemRead with flattened product info."""
+    """Convert OrderItem ORM to OrderItemRead with the product snapshot taken at purchase."""
     return OrderItemRead(
         id=oi.id,
         product_id=oi.product_id,
@@ -36,9 +53,9 @@ def _order_item_to_read(oi: OrderItem) -> OrderItemRead:
         price_at_purchase=oi.price_at_purchase,
         size=oi.size,
         color=oi.color,
-        product_name=oi.product.name if oi.product else None,
-        product_slug=oi.product.slug if oi.product else None,
-        product_image=oi.product.images[0] if oi.product and oi.product.images else None,
+        product_name=oi.product_name,
+        product_slug=oi.product_slug,
+        product_image=oi.product_image,
     )
 
 
@@ -57,123 +74,185 @@ def _order_to_read(order: Order) -> OrderRead:
     )
 
 
+async def _load_items(db: AsyncSession, orders: list[Order]) -> None:
+    """Attach items to orders with one query.
+
+    Filters on the orders' created_at values as well as their ids: order_created_at
+    is the partition key, so partitioned tables only scan those orders' months.
+    """
+    by_order: dict[int, list[OrderItem]] = {order.id: [] for order in orders}
+    if orders:
+        result = await db.execute(
+            select(OrderItem)
+            .where(
+                OrderItem.order_id.in_(by_order),
+                OrderItem.order_created_at.in_({order.created_at for order in orders}),
+            )
+            .order_by(OrderItem.id)
+        )
+        for item in result.scalars():
+            by_order[item.order_id].append(item)
+    for order in orders:
+        set_committed_value(order, "items", by_order[order.id])
+
+
 @router.post("/", response_model=OrderRead, status_code=201)
 async def create_order(
     body: OrderCreate,
+    idempotency_key: str | None = Header(
+        None,
+        alias=IDEMPOTENCY_HEADER,
+        min_length=1,
+        max_length=255,
+        description="Client-generated key; retries with the same key return the original order",
+    ),
     user: User = Depends(current_active_user),
     db: AsyncSession = Depends(get_db),
-) -> OrderRead:
+) -> OrderRead | Response:
     """
     Place an order.
 
+    With an Idempotency-Key header, a retry of a successful request returns the
+    original order (Idempotent-Replayed: true) without touching stock, and a
+    concurrent duplicate waits for the first request to finish.
+
     - Validates address belongs to user
-    - Validates all products exist, are active, and have enough stock
+    - Locks all cart products in one query and validates they exist, are active and in stock
     - Calculates total from current product prices (uses discount_price if set)
-    - Creates Order + OrderItems
-    - Reduces product stock
+    - Reduces stock for every line in one guarded UPDATE (services/checkout.py)
+    - Creates Order + OrderItems and an order.placed outbox event, in one transaction
     """
-    # 1. Validate address ownership
-    addr_result = await db.execute(
-        select(Address).where(
-            Address.id == body.shipping_address_id,
-            Address.user_id == user.id,
-        )
-    )
-    if not addr_result.scalar_one_or_none():
-        raise HTTPException(status_code=404, detail="Shipping address not found")
-
-    # 2. Validate products and calculate total
-    total = Decimal("0")
-    order_items: list[OrderItem] = []
-
-    for cart_item in body.items:
-        product = await db.get(Product, cart_item.product_id)
-        if not product or not product.is_active:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Product ID {cart_item.product_id} not found or inactive",
-            )
-        if product.stock < cart_item.quantity:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Insufficient stock for '{product.name}' (available: {product.stock}, requested: {cart_item.quantity})",
-            )
-
-        # Use discount price if available, else regular price
-        unit_price = product.discount_price if product.discount_price else product.price
-        line_total = unit_price * cart_item.quantity
-        total += line_total
-
-        order_items.append(
-            OrderItem(
-                product_id=product.id,
-                quantity=cart_item.quantity,
-                price_at_purchase=unit_price,
-                size=cart_item.size,
-                color=cart_item.color,
-            )
-        )
-
-        # 3. Reduce stock
-        product.stock -= cart_item.quantity
-
-    # 4. Create order
-    order = Order(
-        user_id=user.id,
-        status="pending",
-        total_amount=total,
-        shipping_address_id=body.shipping_address_id,
-        payment_method=body.payment_method,
-        items=order_items,
-    )
-    db.add(order)
+    if idempotency_key:
+        stored = await claim_key(db, user.id, idempotency_key, request_fingerprint(body))
+        if stored:
+            status_code, content = stored
+            return JSONResponse(content, status_code=status_code, headers={"Idempotent-Replayed": "true"})
+    order = await place_order(db, user.id, body)
+    await db.flush()
+    # Items (with product snapshots) and address are in memory; defaults came back via RETURNING
+    order_read = _order_to_read(order)
+    # Emails, analytics and stock alerts run after commit (services/outbox.py)
+    enqueue_event(db, ORDER_PLACED, order_read.model_dump(mode="json"))
+    if idempotency_key:
+        await store_response(db, user.id, idempotency_key, 201, order_read)
     await db.commit()
-
-    # 5. Re-fetch with relationships for response
-    result = await db.execute(
-        select(Order)
-        .where(Order.id == order.id)
-        .options(
-            selectinload(Order.items).selectinload(OrderItem.product),
-            selectinload(Order.shipping_address),
-        )
-    )
-    order = result.unique().scalar_one()
-    return _order_to_read(order)
+    invalidate_counts(f"order:{user.id}")
+    await bump_stock_version(db)
+    return order_read
 
 
 @router.get("/", response_model=OrderListResponse)
 async def list_orders(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from a previous page; overrides page"),
+    count: CountMode = Query(
+        "exact", description="How to compute total: exact, cached, estimated or none"
+    ),
+    view: Literal["full", "summary"] = Query(
+        "full", description="summary: per-order aggregates instead of items (OrderSummary)"
+    ),
     user: User = Depends(current_active_user),
     db: AsyncSession = Depends(get_db),
 ) -> OrderListResponse:
-    """List the current user's orders (newest first), paginated."""
+    """List the current user's orders (newest first), paginated by page or cursor.
+
+    view=summary returns item count, total quantity and the first item's name
+    and image per order, from one grouped query over order_item only, instead of
+    loading every item. Use GET /orders/{order_id} for the full order.
+    """
     base_q = select(Order).where(Order.user_id == user.id)
+    counter = TotalCounter(
+        count,
+        f"order:{user.id}",
+        filter_signature(user_id=user.id),
+        first_page=page == 1 and not cursor,
+        cursor=cursor is not None,
+    )
 
-    # Total count
-    count_result = await db.execute(select(func.count()).select_from(base_q.subquery()))
-    total = count_result.scalar() or 0
+    if view == "summary":
+        return await _list_order_summaries(db, user.id, counter, page, size, cursor)
 
-    # Paginate
+    # Paginate (total comes from the same query unless the count mode says otherwise)
     q = (
         base_q
-        .order_by(Order.created_at.desc())
-        .offset((page - 1) * size)
-        .limit(size)
-        .options(
-            selectinload(Order.items).selectinload(OrderItem.product),
-            selectinload(Order.shipping_address),
+        .add_columns(*_NEWEST.key_columns())
+        .order_by(*_NEWEST.order_by())
+        .limit(size + 1)
+        .options(selectinload(Order.shipping_address))
+    )
+    q = q.where(_NEWEST.after(cursor)) if cursor else q.offset((page - 1) * size)
+    result = await db.execute(counter.apply(q))
+    rows = result.unique().all()
+    total = await counter.total(db, base_q, rows)
+    rows, next_cursor = _NEWEST.page(rows, size)
+    await _load_items(db, [row[0] for row in rows])
+    return OrderListResponse(
+        total=total,
+        items=[_order_to_read(row[0]) for row in rows],
+        page=page,
+        size=size,
+        next_cursor=next_cursor,
+    )
+
+
+async def _list_order_summaries(
+    db: AsyncSession,
+    user_id: int,
+    counter: TotalCounter,
+    page: int,
+    size: int,
+    cursor: str | None,
+) -> OrderListResponse:
+    """OrderSummary page: pick the page of orders first, then aggregate only their items."""
+    base_q = select(Order.id).where(Order.user_id == user_id)
+    orders_q = (
+        select(
+            Order.id,
+            Order.status,
+            Order.total_amount,
+            Order.payment_method,
+            Order.created_at,
+            *_NEWEST.key_columns(),
+        )
+        .where(Order.user_id == user_id)
+        .order_by(*_NEWEST.order_by())
+        .limit(size + 1)
+    )
+    orders_q = orders_q.where(_NEWEST.after(cursor)) if cursor else orders_q.offset((page - 1) * size)
+    page_orders = counter.apply(orders_q).subquery("page_orders")
+
+    # First line item by id; array_agg(... ORDER BY) keeps it to one pass over the items
+    first_items = aggregate_order_by(OrderItem.product_name, OrderItem.id)
+    first_images = aggregate_order_by(OrderItem.product_image, OrderItem.id)
+    q = (
+        select(
+            *page_orders.c,
+            func.count(OrderItem.id).label("item_count"),
+            func.coalesce(func.sum(OrderItem.quantity), 0).label("total_quantity"),
+            func.array_agg(first_items)[1].label("first_item_name"),
+            func.array_agg(first_images)[1].label("first_item_image"),
         )
+        # order_created_at (the partition key) lets partitioned item scans prune per order
+        .outerjoin(
+            OrderItem,
+            and_(
+                OrderItem.order_id == page_orders.c.id,
+                OrderItem.order_created_at == page_orders.c.created_at,
+            ),
+        )
+        .group_by(*page_orders.c)
+        .order_by(page_orders.c.cursor_0.desc(), page_orders.c.cursor_1.desc())
     )
-    result = await db.execute(q)
-    orders = list(result.unique().scalars().all())
+    rows = (await db.execute(q)).all()
+    total = await counter.total(db, base_q, rows)
+    rows, next_cursor = _NEWEST.page(rows, size)
     return OrderListResponse(
         total=total,
-        items=[_order_to_read(o) for o in orders],
+        items=[OrderSummary.model_validate(row) for row in rows],
         page=page,
         size=size,
+        next_cursor=next_cursor,
     )
 
 
@@ -187,12 +266,10 @@ async def get_order(
     result = await db.execute(
         select(Order)
         .where(Order.id == order_id, Order.user_id == user.id)
-        .options(
-            selectinload(Order.items).selectinload(OrderItem.product),
-            selectinload(Order.shipping_address),
-        )
+        .options(selectinload(Order.shipping_address))
     )
     order = result.unique().scalar_one_or_none()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
+    await _load_items(db, [order])
     return _order_to_read(order)
@@ -1,73 +1,396 @@
 """
-Public products API – list with filters (category_slug, price, search), get by slug.
+Public products API – list with filters (category_slug [+ subcategories], price, search, sizes, colors),
+facet counts for the same filters, typeahead suggestions, batch lookup for carts, get by slug.
 Only active products are returned.
 """
 
 from decimal import Decimal
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import ColumnElement, Integer, String, any_, false, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, array
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config import settings
 from app.database import get_db
 from app.models.category import Category
 from app.models.product import Product
-from app.schemas.product import ProductListResponse, ProductRead
+from app.schemas.product import (
+    ProductBatchRequest,
+    ProductBatchResponse,
+    ProductCartLine,
+    ProductFacets,
+    ProductListResponse,
+    ProductRead,
+    ProductSummary,
+    SuggestionRead,
+)
+from app.services.catalog_cache import category_cache, facet_cache, product_cache
+from app.services.category_paths import subtree_filter
+from app.services.counting import CountMode, TotalCounter, filter_signature
+from app.services.facets import compute_facets
+from app.services.http_cache import (
+    catalog_etag,
+    conditional_get,
+    get_catalog_version,
+    get_product_listing_version,
+    make_etag,
+)
+from app.services.pagination import Keyset
+from app.services.reservations import active_holds
+from app.services.search import search_filter, search_rank
+from app.services.suggest import rebuild_suggest_index, suggest_index
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+# Max ids + slugs per /products/batch call
+BATCH_MAX_ITEMS = 200
+
+# Columns behind ProductSummary (list_products?view=summary); needs a join with Category
+_SUMMARY_COLUMNS = (
+    Product.id,
+    Product.slug,
+    Product.name,
+    Product.price,
+    Product.discount_price,
+    Product.effective_price,
+    Product.images[0].astext.label("image"),
+    (Product.stock > 0).label("in_stock"),
+    Category.slug.label("category_slug"),
+    Category.name.label("category_name"),
+)
+
+# Storefront sort orders (all but relevance), each backed by a partial index on active rows
+_KEYSETS: dict[str, Keyset] = {
+    # ix_product_active_created_at_id
+    "newest": Keyset("newest", Product.created_at, Product.id),
+    # ix_product_active_effective_price_id, scanned in either direction
+    "price_asc": Keyset("price_asc", Product.effective_price, Product.id, descending=False),
+    "price_desc": Keyset("price_desc", Product.effective_price, Product.id),
+    # ix_product_active_discount_id: largest saving (PKR) first
+    "discount": Keyset("discount", Product.price - Product.effective_price, Product.id),
+}
+
+
+class ProductFilters:
+    """Query filters shared by the product listing and facet endpoints (active products only)."""
+
+    def __init__(
+        self,
+        category_slug: str | None = Query(None, description="Filter by category slug"),
+        include_descendants: bool = Query(
+            False, description="With category_slug: also match products in its subcategories"
+        ),
+        min_price: Decimal | None = Query(None, ge=0, description="On effective (charged) price"),
+        max_price: Decimal | None = Query(None, ge=0, description="On effective (charged) price"),
+        search: str | None = Query(None, min_length=1),
+        sizes: list[str] | None = Query(None, description="Products offered in any of these sizes"),
+        colors: list[str] | None = Query(None, description="Products offered in any of these colors"),
+    ) -> None:
+        self.category_slug = category_slug
+        self.include_descendants = include_descendants
+        # Materialized path of category_slug, set by resolve_product_filters when needed
+        self.category_path: str | None = None
+        self.min_price = min_price
+        self.max_price = max_price
+        self.search = search
+        self.sizes = sorted(set(sizes)) if sizes else None
+        self.colors = sorted(set(colors)) if colors else None
+
+    def conditions(self) -> list[ColumnElement[bool]]:
+        """WHERE clauses for these filters."""
+        conditions = [Product.is_active.is_(True)]
+        if self.category_slug and self.include_descendants:
+            if self.category_path is None:
+                conditions.append(false())
+            else:
+                conditions.append(
+                    Product.category_id.in_(
+                        select(Category.id).where(subtree_filter(self.category_path))
+                    )
+                )
+        elif self.category_slug:
+            conditions.append(
+                Product.category_id
+                == select(Category.id).where(Category.slug == self.category_slug).scalar_subquery()
+            )
+        if self.min_price is not None:
+            conditions.append(Product.effective_price >= self.min_price)
+        if self.max_price is not None:
+            conditions.append(Product.effective_price <= self.max_price)
+        if self.search:
+            conditions.append(search_filter(self.search))
+        # JSONB ?| (any of) – served by the GIN indexes on sizes/colors
+        if self.sizes:
+            conditions.append(Product.sizes.has_any(array(self.sizes)))
+        if self.colors:
+            conditions.append(Product.colors.has_any(array(self.colors)))
+        return conditions
+
+    def signature(self) -> tuple[tuple[str, str], ...]:
+        """Normalized cache key for these filters."""
+        return filter_signature(
+            category_slug=self.category_slug,
+            include_descendants=self.include_descendants or None,
+            min_price=self.min_price,
+            max_price=self.max_price,
+            search=self.search,
+            sizes=self.sizes,
+            colors=self.colors,
+        )
+
+
+async def resolve_product_filters(
+    filters: ProductFilters = Depends(),
+    db: AsyncSession = Depends(get_db),
+) -> ProductFilters:
+    """ProductFilters with the category subtree path looked up (cached) for include_descendants."""
+    slug = filters.category_slug
+    if slug and filters.include_descendants:
+
+        async def load() -> str | None:
+            result = await db.execute(select(Category.path).where(Category.slug == slug))
+            return result.scalar_one_or_none()
+
+        filters.category_path = await category_cache.get_or_load(("path", slug), load)
+    return filters
+
 
 @router.get("/", response_model=ProductListResponse)
 async def list_products(
-    category_slug: str | None = Query(None, description="Filter by category slug"),
-    min_price: Decimal | None = Query(None, ge=0),
-    max_price: Decimal | None = Query(None, ge=0),
-    search: str | None = Query(None, min_length=1),
+    request: Request,
+    response: Response,
+    filters: ProductFilters = Depends(resolve_product_filters),
+    sort: Literal["relevance", "newest", "price_asc", "price_desc", "discount"] | None = Query(
+        None, description="Default: relevance when searching, else newest"
+    ),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from a previous page; overrides page"),
+    count: CountMode = Query(
+        "exact", description="How to compute total: exact, cached, estimated or none"
+    ),
+    view: Literal["full", "summary"] = Query(
+        "full", description="summary: grid-card fields only (ProductSummary)"
+    ),
     db: AsyncSession = Depends(get_db),
-) -> ProductListResponse:
-    """List active products with optional filters and pagination."""
-    q = select(Product).where(Product.is_active.is_(True))
-    if category_slug:
-        q = q.join(Category, Product.category_id == Category.id).where(
-            Category.slug == category_slug
-        )
-    if min_price is not None:
-        q = q.where(Product.price >= min_price)
-    if max_price is not None:
-        q = q.where(Product.price <= max_price)
-    if search:
-        pattern = f"%{search}%"
-        q = q.where(
-            (Product.name.ilike(pattern)) | (Product.description.ilike(pattern))
-        )
-    # Total count (same filters, no pagination)
-    total_result = await db.execute(select(func.count()).select_from(q.subquery()))
-    total = total_result.scalar() or 0
+) -> ProductListResponse | Response:
+    """List active products with optional filters and pagination.
+
+    Pages can be fetched by number (page/size) or by following next_cursor,
+    which stays fast at any depth. Cursors are not available for relevance order.
+    Price filters and sorts use effective_price, the price checkout charges.
+    view=summary selects only card columns through one join with category
+    instead of loading full ORM rows. Supports conditional GET (304) against
+    the catalog and stock versions (ETag only).
+    """
+    version, stock_version = await get_product_listing_version(db)
+    not_modified = conditional_get(request, response, catalog_etag(request, version, stock_version), None)
+    if not_modified:
+        return not_modified
+    search = filters.search
+    conditions = filters.conditions()
+    if view == "summary":
+        q = select(*_SUMMARY_COLUMNS).join(Category, Category.id == Product.category_id)
+    else:
+        q = select(Product).options(selectinload(Product.category))
+    q = q.where(*conditions)
+    if sort is None:
+        sort = "relevance" if search else "newest"
+    signature = filters.signature()
+    counter = TotalCounter(
+        count,
+        "product",
+        signature,
+        first_page=page == 1 and not cursor,
+        cursor=cursor is not None,
+        # Partial index over active rows: its reltuples estimates the unfiltered total
+        estimate_relation=None if signature else "ix_product_active_created_at_id",
+    )
+    base_q = select(Product.id).where(*conditions)
     # Paginate and order
-    q = q.order_by(Product.created_at.desc()).offset((page - 1) * size).limit(size)
-    q = q.options(selectinload(Product.category))
+    keyset = None if sort == "relevance" and search else _KEYSETS.get(sort, _KEYSETS["newest"])
+    if keyset is None:
+        if cursor:
+            raise HTTPException(
+                status_code=400,
+                detail="Cursor pagination is not available for relevance order",
+            )
+        q = q.order_by(search_rank(search).desc(), Product.created_at.desc())
+        q = q.offset((page - 1) * size).limit(size)
+    else:
+        q = q.add_columns(*keyset.key_columns()).order_by(*keyset.order_by())
+        q = q.where(keyset.after(cursor)) if cursor else q.offset((page - 1) * size)
+        q = q.limit(size + 1)
+    result = await db.execute(counter.apply(q))
+    rows = result.all()
+    total = await counter.total(db, base_q, rows)
+    next_cursor = None
+    if keyset is not None:
+        rows, next_cursor = keyset.page(rows, size)
+    if view == "summary":
+        items = [ProductSummary.model_validate(row) for row in rows]
+    else:
+        items = [ProductRead.model_validate(row[0]) for row in rows]
+    return ProductListResponse(total=total, items=items, page=page, size=size, next_cursor=next_cursor)
+
+
+@router.get("/facets", response_model=ProductFacets)
+async def get_product_facets(
+    request: Request,
+    response: Response,
+    filters: ProductFilters = Depends(resolve_product_filters),
+    db: AsyncSession = Depends(get_db),
+) -> ProductFacets | Response:
+    """Counts per category, price bucket, size and color over the filtered products.
+
+    Computed in one grouped query and cached per filter signature until the next catalog write.
+    """
+    version, last_modified = await get_catalog_version(db)
+    not_modified = conditional_get(request, response, catalog_etag(request, version), last_modified)
+    if not_modified:
+        return not_modified
+    return await facet_cache.get_or_load(
+        (filters.signature(), version), lambda: compute_facets(db, filters.conditions())
+    )
+
+
+@router.get("/suggest", response_model=list[SuggestionRead])
+async def suggest_products(
+    q: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=settings.SUGGEST_MAX_LIMIT),
+    db: AsyncSession = Depends(get_db),
+) -> list[SuggestionRead]:
+    """Typeahead: categories and active products with a name word starting with q.
+
+    Served from the in-process prefix index (services/suggest.py); no query per keystroke.
+    """
+    if not suggest_index.built:
+        await rebuild_suggest_index(db)
+    return [SuggestionRead.model_validate(s) for s in suggest_index.search(q, limit)]
+
+
+async def _batch_lookup(db: AsyncSession, ids: list[int], slugs: list[str]) -> ProductBatchResponse:
+    """Hydrate active products by id and/or slug with one `= ANY(...)` query."""
+    ids = list(dict.fromkeys(ids))
+    slugs = list(dict.fromkeys(slugs))
+    if len(ids) + len(slugs) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BATCH_MAX_ITEMS} ids and slugs per request",
+        )
+    if not ids and not slugs:
+        return ProductBatchResponse(items=[])
+    q = select(
+        Product.id,
+        Product.slug,
+        Product.name,
+        Product.price,
+        Product.discount_price,
+        Product.effective_price,
+        Product.images[0].astext.label("image"),
+        Product.stock,
+        func.greatest(Product.stock - active_holds(Product.id), 0).label("available"),
+        Product.sizes,
+        Product.colors,
+    ).where(
+        Product.is_active.is_(True),
+        or_(
+            Product.id == any_(literal(ids, ARRAY(Integer))),
+            Product.slug == any_(literal(slugs, ARRAY(String))),
+        ),
+    )
     result = await db.execute(q)
-    products = list(result.unique().scalars().all())
-    items = [ProductRead.model_validate(p) for p in products]
-    return ProductListResponse(total=total, items=items, page=page, size=size)
+    found = {row.id: row for row in result.all()}
+    by_slug = {row.slug: row for row in found.values()}
+    # Request order: ids first, then slugs, each product once
+    ordered = [found[i] for i in ids if i in found]
+    ordered += [by_slug[s] for s in slugs if s in by_slug and by_slug[s].id not in ids]
+    return ProductBatchResponse(
+        items=[
+            ProductCartLine(**row._mapping, unit_price=row.effective_price)
+            for row in ordered
+        ],
+        missing_ids=[i for i in ids if i not in found],
+        missing_slugs=[s for s in slugs if s not in by_slug],
+    )
+
+
+@router.get("/batch", response_model=ProductBatchResponse)
+async def get_products_batch(
+    ids: list[int] = Query([], description=f"Product ids (ids + slugs <= {BATCH_MAX_ITEMS})"),
+    slugs: list[str] = Query([], description="Product slugs"),
+    db: AsyncSession = Depends(get_db),
+) -> ProductBatchResponse:
+    """Cart-line fields for many products in one request (live stock, not cached)."""
+    return await _batch_lookup(db, ids, slugs)
+
+
+@router.post("/batch", response_model=ProductBatchResponse)
+async def post_products_batch(
+    body: ProductBatchRequest,
+    db: AsyncSession = Depends(get_db),
+) -> ProductBatchResponse:
+    """Same as GET /products/batch, for carts too large for a query string."""
+    return await _batch_lookup(db, body.ids, body.slugs)
 
 
 @router.get("/{slug}", response_model=ProductRead)
 async def get_product_by_slug(
     slug: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-) -> ProductRead:
-    """Get a product by slug. Returns 404 if not found or inactive."""
-    q = (
-        select(Product)
-        .where(Product.slug == slug, Product.is_active.is_(True))
-        .options(selectinload(Product.category))
-    )
-    result = await db.execute(q)
-    product = result.unique().scalar_one_or_none()
+) -> ProductRead | Response:
+    """Get a product by slug. Returns 404 if not found or inactive. Served from the read cache.
+
+    Stock and updated_at are read live by primary key: a cached body older than
+    the row's updated_at (another worker's write, or an order) is reloaded, so
+    orders and other workers' writes show up immediately. ETag/Last-Modified
+    come from the product's (and its category's) updated_at and the stock.
+    """
+
+    async def load() -> ProductRead | None:
+        q = (
+            select(Product)
+            .where(Product.slug == slug, Product.is_active.is_(True))
+            .options(selectinload(Product.category))
+        )
+        result = await db.execute(q)
+        product = result.unique().scalar_one_or_none()
+        return ProductRead.model_validate(product) if product else None
+
+    key = ("slug", slug)
+    product = await product_cache.get_or_load(key, load)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    return ProductRead.model_validate(product)
+    live = (
+        await db.execute(
+            select(Product.stock, Product.updated_at).where(
+                Product.id == product.id, Product.is_active.is_(True)
+            )
+        )
+    ).one_or_none()
+    if not live:
+        # Deleted or deactivated by another worker since it was cached
+        product_cache.discard(key)
+        raise HTTPException(status_code=404, detail="Product not found")
+    if live.updated_at != product.updated_at:
+        # Any field may have changed since the body was cached: reload it whole
+        product_cache.discard(key)
+        product = await product_cache.get_or_load(key, load)
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+    elif live.stock != product.stock:
+        # Stock written without touching updated_at (e.g. by hand); the rest is current
+        product = product.model_copy(update={"stock": live.stock})
+    last_modified = product.updated_at
+    if product.category and product.category.updated_at > last_modified:
+        last_modified = product.category.updated_at
+    etag = make_etag("product", product.id, last_modified.isoformat(), product.stock)
+    not_modified = conditional_get(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+    return product
@@ -0,0 +1,59 @@
+"""
+Reservations API – hold cart stock for a limited time, list and release holds.
+All endpoints require authentication.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import current_active_user
+from app.database import get_db
+from app.models.stock_reservation import StockReservation
+from app.models.user import User
+from app.schemas.reservation import ReservationCreate, ReservationRead
+from app.services.reservations import release, reserve
+
+router = APIRouter(prefix="/reservations", tags=["reservations"])
+
+
+@router.get("/", response_model=list[ReservationRead])
+async def list_reservations(
+    user: User = Depends(current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[ReservationRead]:
+    """The current user's active (unexpired) holds."""
+    result = await db.execute(
+        select(StockReservation)
+        .where(StockReservation.user_id == user.id, StockReservation.expires_at > func.now())
+        .order_by(StockReservation.expires_at)
+    )
+    return [ReservationRead.model_validate(r) for r in result.scalars().all()]
+
+
+@router.post("/", response_model=ReservationRead)
+async def create_reservation(
+    body: ReservationCreate,
+    user: User = Depends(current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> ReservationRead:
+    """Hold stock for the cart; replaces any existing hold on the product and restarts its TTL.
+
+    409 if fewer units are free (stock minus other shoppers' holds).
+    """
+    reservation = await reserve(db, user.id, body.product_id, body.quantity)
+    await db.commit()
+    return ReservationRead.model_validate(reservation)
+
+
+@router.delete("/{product_id}", status_code=204)
+async def delete_reservation(
+    product_id: int,
+    user: User = Depends(current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """Release the current user's hold on a product."""
+    if not await release(db, user.id, [product_id]):
+        raise HTTPException(status_code=404, detail="Reservation not found")
+    await db.commit()
+    return None
@@ -1,21 +1,27 @@
 """
-Wishlist API – add, remove, list. All endpoints require authentication.
+Wishlist API – add, remove, list, and id lookups for product grids. All endpoints require authentication.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, literal, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager, selectinload
 
 from app.auth import current_active_user
 from app.database import get_db
 from app.models.product import Product
 from app.models.user import User
 from app.models.wishlist import Wishlist
-from app.schemas.wishlist import WishlistRead
+from app.schemas.product import ProductRead
+from app.schemas.wishlist import WishlistIds, WishlistRead
+from app.services.wishlist_cache import invalidate_wishlist, wishlisted_ids
 
 router = APIRouter(prefix="/wishlist", tags=["wishlist"])
 
+# Max ids per /wishlist/contains call (a few grid pages)
+CONTAINS_MAX_IDS = 200
+
 
 @router.get("/", response_model=list[WishlistRead])
 async def list_wishlist(
@@ -33,40 +39,71 @@ async def list_wishlist(
     return [WishlistRead.model_validate(w) for w in items]
 
 
+@router.get("/ids", response_model=WishlistIds)
+async def get_wishlist_ids(
+    user: User = Depends(current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> WishlistIds:
+    """All product ids in the current user's wishlist, ascending (cached per user)."""
+    return WishlistIds(product_ids=sorted(await wishlisted_ids(db, user.id)))
+
+
+@router.get("/contains", response_model=WishlistIds)
+async def wishlist_contains(
+    ids: list[int] = Query(..., description=f"Product ids to check (at most {CONTAINS_MAX_IDS})"),
+    user: User = Depends(current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> WishlistIds:
+    """Which of the given product ids are in the current user's wishlist (request order)."""
+    if len(ids) > CONTAINS_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {CONTAINS_MAX_IDS} ids per request")
+    wishlisted = await wishlisted_ids(db, user.id)
+    return WishlistIds(product_ids=[i for i in dict.fromkeys(ids) if i in wishlisted])
+
+
 @router.post("/add/{product_id}", response_model=WishlistRead, status_code=201)
 async def add_to_wishlist(
     product_id: int,
     user: User = Depends(current_active_user),
     db: AsyncSession = Depends(get_db),
 ) -> WishlistRead:
-    """Add a product to the wishlist. Returns 409 if already exists, 404 if product missing."""
-    # Check product exists and is active
-    product = await db.get(Product, product_id)
-    if not product or not product.is_active:
-        raise HTTPException(status_code=404, detail="Product not found")
+    """Add a product to the wishlist. Returns 409 if already exists, 404 if product missing.
 
-    # Check not already in wishlist
-    existing = await db.execute(
-        select(Wishlist).where(
-            Wishlist.user_id == user.id,
-            Wishlist.product_id == product_id,
+    One statement: INSERT ... SELECT from active products ON CONFLICT DO NOTHING
+    RETURNING, in a CTE outer-joined to the active product and its category. No
+    row means the product is missing or inactive; a row without added_at means
+    the entry already existed. The primary key settles concurrent adds.
+    """
+    inserted = (
+        insert(Wishlist)
+        .from_select(
+            ["user_id", "product_id"],
+            select(literal(user.id), Product.id).where(Product.id == product_id, Product.is_active),
         )
+        .on_conflict_do_nothing(index_elements=["user_id", "product_id"])
+        .returning(Wishlist.product_id, Wishlist.added_at)
+        .cte("inserted")
+    )
+    result = await db.execute(
+        select(Product, inserted.c.added_at)
+        .join(Product.category)
+        .outerjoin(inserted, inserted.c.product_id == Product.id)
+        .where(Product.id == product_id, Product.is_active)
+        .options(contains_eager(Product.category))
     )
-    if existing.scalar_one_or_none():
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    if row.added_at is None:
         raise HTTPException(status_code=409, detail="Product already in wishlist")
-
-    wishlist_item = Wishlist(user_id=user.id, product_id=product_id)
-    db.add(wishlist_item)
     await db.commit()
-
-    # Re-fetch with product joined for response
-    result = await db.execute(
-        select(Wishlist)
-        .where(Wishlist.user_id == user.id, Wishlist.product_id == product_id)
-        .options(selectinload(Wishlist.product).selectinload(Product.category))
+    invalidate_wishlist(user.id)
+    product, added_at = row
+    return WishlistRead(
+        product_id=product.id,
+        added_at=added_at,
+        product=ProductRead.model_validate(product),
     )
-    item = result.unique().scalar_one()
-    return WishlistRead.model_validate(item)
 
 
 @router.delete("/remove/{product_id}", status_code=204)
@@ -75,16 +112,13 @@ async def remove_from_wishlist(
     user: User = Depends(current_active_user),
     db: AsyncSession = Depends(get_db),
 ) -> None:
-    """Remove a product from the wishlist."""
+    """Remove a product from the wishlist (one DELETE ... RETURNING)."""
     result = await db.execute(
-        select(Wishlist).where(
-            Wishlist.user_id == user.id,
-            Wishlist.product_id == product_id,
-        )
+        delete(Wishlist)
+        .where(Wishlist.user_id == user.id, Wishlist.product_id == product_id)
+        .returning(Wishlist.product_id)
     )
-    item = result.scalar_one_or_none()
-    if not item:
+    if result.first() is None:
         raise HTTPException(status_code=404, detail="Product not in wishlist")
-
-    await db.delete(item)
     await db.commit()
+    invalidate_wishlist(user.id)
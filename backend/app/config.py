@@ -35,6 +35,64 @@ class Settings(BaseSettings):
     # CORS allowed origins: in .env use comma-separated string; we expose as list
     CORS_ORIGINS: str = "http://localhost:3000,http://127.0.0.1:3000"
 
+    # Listing totals: TTL for cached counts, and the size above which count=estimated
+    # trusts planner statistics instead of counting
+    COUNT_CACHE_TTL_SECONDS: int = 60
+    COUNT_ESTIMATE_MIN_ROWS: int = 100_000
+
+    # In-process catalog read cache (product/category detail, category lists)
+    CATALOG_CACHE_TTL_SECONDS: int = 300
+    CATALOG_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Per-user wishlisted product ids (grid hearts); writes invalidate in the same worker
+    WISHLIST_CACHE_TTL_SECONDS: int = 60
+    WISHLIST_CACHE_MAX_ENTRIES: int = 50_000
+
+    # Cache-Control for public catalog responses (browsers and CDN revalidate via ETag)
+    CATALOG_HTTP_MAX_AGE_SECONDS: int = 60
+    CATALOG_HTTP_STALE_SECONDS: int = 300
+
+    # Typeahead index: full rebuild interval (admin writes also patch it immediately)
+    SUGGEST_REBUILD_SECONDS: int = 300
+    SUGGEST_MAX_LIMIT: int = 20
+
+    # Idempotency-Key on POST /orders: how long a key is remembered, and the purge interval
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_PURGE_SECONDS: int = 3600
+
+    # Cart stock holds: lifetime of a hold, and how often / how many expired holds are swept
+    RESERVATION_TTL_SECONDS: int = 900
+    RESERVATION_SWEEP_SECONDS: int = 60
+    RESERVATION_SWEEP_BATCH: int = 1000
+
+    # Sharded stock for flash-sale products: how often product.stock is re-summed from the shards
+    STOCK_SHARD_SYNC_SECONDS: int = 5
+
+    # Monthly range partitions for order/order_item: read by migration 015 when it runs
+    # (enabling later: scripts/order_partitions.py partition), then kept ahead by a daily lifespan job
+    ORDER_PARTITIONING: bool = False
+    ORDER_PARTITION_MONTHS_AHEAD: int = 3
+    ORDER_PARTITION_MAINTENANCE_SECONDS: int = 86_400
+
+    # Daily sales rollups for admin reports: refresh interval, and the longest range one
+    # report may cover
+    SALES_ROLLUP_REFRESH_SECONDS: int = 60
+    SALES_REPORT_MAX_DAYS: int = 366
+
+    # Transactional outbox (post-order side effects): run the worker inside each API process
+    # (else use scripts/outbox_worker.py), polling, batching, retry backoff and retention
+    OUTBOX_WORKER_IN_PROCESS: bool = True
+    OUTBOX_POLL_SECONDS: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_RETRY_BASE_SECONDS: int = 5
+    OUTBOX_RETRY_MAX_SECONDS: int = 3600
+    OUTBOX_RETENTION_HOURS: int = 168
+    OUTBOX_PURGE_SECONDS: int = 3600
+
+    # Ordered products at or below this stock trigger a low-stock alert (outbox handler)
+    LOW_STOCK_ALERT_THRESHOLD: int = 5
+
     @property
     def async_database_url(self) -> str:
         """DATABASE_URL guaranteed to use the asyncpg driver.
@@ -3,6 +3,10 @@ Hanzla Outlet API – FastAPI application entry point.
 CORS and config driven from app.config; auth and users under /api/v1.
 """
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -13,13 +17,69 @@ from app.api.v1 import (
     categories_router,
     orders_router,
     products_router,
+    reservations_router,
     users_router,
     wishlist_router,
     ai_router,
 )
 from app.config import settings
+from app.database import async_session_maker
+from app.services.idempotency import purge_expired_keys
+from app.services.order_partitions import ensure_order_partitions
+from app.services.outbox import drain_outbox, purge_processed_events
+from app.services.reservations import sweep_expired_reservations
+from app.services.sales_rollups import refresh_sales_rollups
+from app.services.scheduler import run_every
+from app.services.stock_shards import sync_sharded_stock
+from app.services.suggest import rebuild_suggest_index
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm in-process indexes and start periodic background jobs."""
+    try:
+        async with async_session_maker() as db:
+            await rebuild_suggest_index(db)
+    except Exception:
+        # Not fatal: /products/suggest builds the index on first use, or the periodic rebuild does
+        logger.exception("Could not build the suggest index at startup")
+    tasks = [
+        asyncio.create_task(run_every(settings.SUGGEST_REBUILD_SECONDS, rebuild_suggest_index)),
+        asyncio.create_task(run_every(settings.IDEMPOTENCY_PURGE_SECONDS, purge_expired_keys)),
+        asyncio.create_task(
+            run_every(settings.RESERVATION_SWEEP_SECONDS, sweep_expired_reservations)
+        ),
+        asyncio.create_task(run_every(settings.STOCK_SHARD_SYNC_SECONDS, sync_sharded_stock)),
+        asyncio.create_task(
+            run_every(settings.SALES_ROLLUP_REFRESH_SECONDS, refresh_sales_rollups)
+        ),
+    ]
+    if settings.OUTBOX_WORKER_IN_PROCESS:
+        tasks += [
+            asyncio.create_task(run_every(settings.OUTBOX_POLL_SECONDS, drain_outbox)),
+            asyncio.create_task(run_every(settings.OUTBOX_PURGE_SECONDS, purge_processed_events)),
+        ]
+    if settings.ORDER_PARTITIONING:
+        try:
+            async with async_session_maker() as db:
+                await ensure_order_partitions(db)
+        except Exception:
+            # Not fatal: the periodic job below retries, and months ahead already exist
+            logger.exception("Could not create upcoming order partitions at startup")
+        tasks.append(
+            asyncio.create_task(
+                run_every(settings.ORDER_PARTITION_MAINTENANCE_SECONDS, ensure_order_partitions)
+            )
+        )
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
 
-app = FastAPI(title="Hanzla Outlet API")
+app = FastAPI(title="Hanzla Outlet API", lifespan=lifespan)
 
 # CORS: origins from config (.env CORS_ORIGINS or default localhost:3000)
 app.add_middleware(
@@ -31,7 +91,7 @@ app.add_middleware(
 )
 
 
-# API v1: auth, users, categories, products, admin, addresses, wishlist, orders
+# API v1: auth, users, categories, products, admin, addresses, wishlist, orders, reservations
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(users_router, prefix="/api/v1")
 app.include_router(categories_router, prefix="/api/v1")
@@ -40,6 +100,7 @@ app.include_router(admin_router, prefix="/api/v1")
 app.include_router(addresses_router, prefix="/api/v1")
 app.include_router(wishlist_router, prefix="/api/v1")
 app.include_router(orders_router, prefix="/api/v1")
+app.include_router(reservations_router, prefix="/api/v1")
 app.include_router(ai_router, prefix="/api/v1")
 
 
@@ -8,6 +8,17 @@ from app.models.address import Address
 from app.models.wishlist import Wishlist
 from app.models.order import Order
 from app.models.order_item import OrderItem
+from app.models.catalog_state import CatalogState
+from app.models.idempotency_key import IdempotencyKey
+from app.models.stock_reservation import StockReservation
+from app.models.product_stock_shard import ProductStockShard
+from app.models.outbox_event import OutboxEvent
+from app.models.sales_rollup import (
+    SalesDaily,
+    SalesDailyCategory,
+    SalesDailyProduct,
+    SalesRollupState,
+)
 
 __all__ = [
     "Base",
@@ -18,4 +29,13 @@ __all__ = [
     "Wishlist",
     "Order",
     "OrderItem",
+    "CatalogState",
+    "IdempotencyKey",
+    "StockReservation",
+    "ProductStockShard",
+    "SalesRollupState",
+    "SalesDaily",
+    "SalesDailyCategory",
+    "SalesDailyProduct",
+    "OutboxEvent",
 ]
@@ -0,0 +1,30 @@
+"""
+CatalogState model – single-row catalog version used for HTTP validators, and the
+catalog_stock_version sequence that stock changes advance.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, Sequence, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class CatalogState(Base):
+    """One row (id=1) whose version is bumped by every admin catalog write."""
+
+    __tablename__ = "catalog_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=1, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+# Advanced after every commit that changes product stock. A sequence, not a column on
+# catalog_state: nextval never blocks, so concurrent checkouts don't queue on one row.
+catalog_stock_version = Sequence("catalog_stock_version", metadata=Base.metadata)
@@ -4,16 +4,20 @@ Category model – hierarchical (optional parent_id).
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
 
 
 class Category(Base):
-    """Category table: name, slug, optional parent for hierarchy."""
+    """Category table: name, slug, optional parent for hierarchy, maintained product counters."""
 
     __tablename__ = "category"
+    __table_args__ = (
+        # Subtree lookups are prefix ranges on path (services/category_paths.py)
+        Index("ix_category_path", "path", postgresql_ops={"path": "varchar_pattern_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, index=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
@@ -23,6 +27,11 @@ class Category(Base):
         ForeignKey("category.id", ondelete="SET NULL"),
         nullable=True,
     )
+    # Materialized path of ids from the root, e.g. "/1/5/9/"
+    path: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Active products here / here and in all descendants (services/category_counts.py)
+    product_count: Mapped[int] = mapped_column(Integer, server_default="0", nullable=False)
+    subtree_product_count: Mapped[int] = mapped_column(Integer, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
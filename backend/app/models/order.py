@@ -5,7 +5,7 @@ Order model – represents a customer purchase with status tracking.
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, String, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, Numeric, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -15,6 +15,17 @@ class Order(Base):
     """Order table: user, status, total, shipping address, payment method."""
 
     __tablename__ = "order"
+    # May be range-partitioned by month on created_at (ORDER_PARTITIONING, migration 015);
+    # the database primary key is then (id, created_at)
+    __table_args__ = (
+        # Per-user history, newest first (keyset pagination on created_at, id)
+        Index("ix_order_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Orders the sales rollup refresh has yet to fold in (services/sales_rollups.py)
+        Index("ix_order_pending_rollup", "id", postgresql_where=text("NOT rolled_up")),
+    )
+    # Fetch id/created_at/updated_at with RETURNING on flush, so a new order can be
+    # serialized straight after commit
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
@@ -47,6 +58,13 @@ class Order(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    # Set by the sales rollup refresh in the transaction that counts the order
+    rolled_up: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default=text("false"),
+        nullable=False,
+    )
 
     user: Mapped["User"] = relationship("User", back_populates="orders")  # noqa: F821
     shipping_address: Mapped["Address"] = relationship("Address", lazy="joined")  # noqa: F821
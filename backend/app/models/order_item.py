@@ -2,16 +2,17 @@
 OrderItem model – line item within an order.
 """
 
+from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import ForeignKey, Integer, Numeric, String
+from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
 
 
 class OrderItem(Base):
-    """Individual item in an order: product, quantity, price snapshot, size/color."""
+    """Individual item in an order: product, quantity, price and display snapshot, size/color."""
 
     __tablename__ = "order_item"
 
@@ -29,6 +30,17 @@ class OrderItem(Base):
     price_at_purchase: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     size: Mapped[str | None] = mapped_column(String(30), nullable=True)
     color: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    # Product display data as it was at purchase; order reads never join product
+    product_name: Mapped[str] = mapped_column(String(200), nullable=False)
+    product_slug: Mapped[str] = mapped_column(String(250), nullable=False)
+    product_image: Mapped[str | None] = mapped_column(Text, nullable=True)  # first image URL
+    # Copy of order.created_at: both default to now(), the start of the transaction that
+    # inserts them. Partition key when order tables are partitioned (services/order_partitions.py)
+    order_created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
 
     order: Mapped["Order"] = relationship("Order", back_populates="items")  # noqa: F821
-    product: Mapped["Product"] = relationship("Product", lazy="joined")  # noqa: F821
+    product: Mapped["Product"] = relationship("Product")  # noqa: F821
@@ -0,0 +1,52 @@
+"""
+OutboxEvent model – side effect recorded in a business transaction, delivered later by a worker.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class OutboxEvent(Base):
+    """One event (topic + JSON payload) and its delivery state; see services/outbox.py."""
+
+    __tablename__ = "outbox_event"
+    __table_args__ = (
+        # Worker claim: pending events that are due, oldest first
+        Index(
+            "ix_outbox_event_pending",
+            "available_at",
+            "id",
+            postgresql_where=text("processed_at IS NULL AND failed_at IS NULL"),
+        ),
+        # Retention purge of delivered events
+        Index(
+            "ix_outbox_event_processed_at",
+            "processed_at",
+            postgresql_where=text("processed_at IS NOT NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    topic: Mapped[str] = mapped_column(String(100), nullable=False)  # e.g. "order.placed"
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    # Not picked up before this time (pushed back after each failed attempt)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Set when OUTBOX_MAX_ATTEMPTS is reached; the event is not retried again
+    failed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
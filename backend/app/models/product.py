@@ -5,8 +5,20 @@ Product model – catalog item with price, images, sizes, colors, stock.
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, String, Text, func
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import (
+    Boolean,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -16,6 +28,40 @@ class Product(Base):
     """Product table: name, slug, price, images, sizes, colors, stock, category."""
 
     __tablename__ = "product"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id): active-only for the storefront, all for admin
+        Index(
+            "ix_product_active_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        Index("ix_product_created_at_id", "created_at", "id"),
+        # Price and discount sorts (keyset on (key, id)); scanned backwards for DESC
+        Index(
+            "ix_product_active_effective_price_id",
+            "effective_price",
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_product_active_discount_id",
+            text("(price - effective_price)"),
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        # Facet filters: sizes ?| array[...] / colors ?| array[...]
+        Index("ix_product_sizes", "sizes", postgresql_using="gin"),
+        Index("ix_product_colors", "colors", postgresql_using="gin"),
+        # Full-text search over search_vector, trigram similarity on name (pg_trgm)
+        Index("ix_product_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_product_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(200), index=True, nullable=False)
@@ -23,16 +69,36 @@ class Product(Base):
     description: Mapped[str] = mapped_column(Text, nullable=False)
     price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     discount_price: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True)
+    # What checkout charges: discount_price unless unset or zero, else price
+    effective_price: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2),
+        Computed("coalesce(nullif(discount_price, 0), price)", persisted=True),
+    )
     images: Mapped[list] = mapped_column(JSONB, default=list, nullable=False)  # list of URL strings
     sizes: Mapped[list] = mapped_column(JSONB, default=list, nullable=False)  # e.g. ["S", "M", "L"]
     colors: Mapped[list] = mapped_column(JSONB, default=list, nullable=False)  # e.g. ["Black", "Red"]
     stock: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Stock split across product_stock_shard rows; stock above is then their synced sum
+    # (services/stock_shards.py)
+    stock_sharded: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=text("false"), nullable=False
+    )
     category_id: Mapped[int] = mapped_column(
         ForeignKey("category.id", ondelete="RESTRICT"),
         index=True,
         nullable=False,
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Maintained by Postgres: name weighted A, description weighted B (see services/search.py)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
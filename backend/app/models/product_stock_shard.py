@@ -0,0 +1,22 @@
+"""
+ProductStockShard model – one slice of a sharded product's stock.
+"""
+
+from sqlalchemy import CheckConstraint, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ProductStockShard(Base):
+    """Stock counter row (product_id, shard); a sharded product's stock is the sum of its shards."""
+
+    __tablename__ = "product_stock_shard"
+    __table_args__ = (CheckConstraint("stock >= 0", name="ck_product_stock_shard_stock"),)
+
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("product.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    shard: Mapped[int] = mapped_column(Integer, primary_key=True)
+    stock: Mapped[int] = mapped_column(Integer, nullable=False)
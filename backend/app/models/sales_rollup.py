@@ -0,0 +1,58 @@
+"""
+Sales rollup models – daily revenue/units per store, category and product for admin reports.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, Index, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class SalesRollupState(Base):
+    """One row (id=1), locked by the worker refreshing or rebuilding the rollups."""
+
+    __tablename__ = "sales_rollup_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+class SalesDaily(Base):
+    """Store-wide totals for one UTC day."""
+
+    __tablename__ = "sales_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    units: Mapped[int] = mapped_column(Integer, nullable=False)
+    orders: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class SalesDailyCategory(Base):
+    """Totals for one category (the product's category when rolled up) and UTC day."""
+
+    __tablename__ = "sales_daily_category"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    category_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    units: Mapped[int] = mapped_column(Integer, nullable=False)
+    orders: Mapped[int] = mapped_column(Integer, nullable=False)  # orders with this category
+
+
+class SalesDailyProduct(Base):
+    """Totals for one product and UTC day."""
+
+    __tablename__ = "sales_daily_product"
+    __table_args__ = (
+        # Per-product series (GET /admin/reports/sales/products/{id})
+        Index("ix_sales_daily_product_product_day", "product_id", "day"),
+    )
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    product_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    units: Mapped[int] = mapped_column(Integer, nullable=False)
+    orders: Mapped[int] = mapped_column(Integer, nullable=False)  # orders with this product
@@ -0,0 +1,45 @@
+"""
+StockReservation model – time-limited hold on product stock for a user's cart.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class StockReservation(Base):
+    """Hold of quantity units of a product by a user until expires_at (one per user and product)."""
+
+    __tablename__ = "stock_reservation"
+    __table_args__ = (
+        UniqueConstraint("user_id", "product_id", name="uq_stock_reservation_user_product"),
+        # Active holds per product: index-only sum(quantity) WHERE expires_at > now()
+        Index(
+            "ix_stock_reservation_product_expires",
+            "product_id",
+            "expires_at",
+            postgresql_include=["quantity", "user_id"],
+        ),
+        # Sweeper: oldest expired first
+        Index("ix_stock_reservation_expires_at", "expires_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("product.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
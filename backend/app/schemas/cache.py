@@ -0,0 +1,17 @@
+"""
+Cache stats schema – in-process cache counters for the admin stats endpoint.
+"""
+
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    """Counters for one named cache since process start."""
+
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    coalesced: int  # misses that waited on another request's load
+    evictions: int  # LRU evictions at capacity
+    expirations: int  # entries dropped after their TTL
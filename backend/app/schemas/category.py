@@ -42,9 +42,21 @@ class CategoryRead(CategoryBase):
 
 
 class CategoryReadWithCount(CategoryRead):
-    """Category with product count (e.g. for detail by slug)."""
+    """Category with active product counts (e.g. for detail by slug)."""
 
     products_count: int = 0
+    subtree_products_count: int = 0  # including all descendant categories
+
+
+class CategoryTreeNode(BaseModel):
+    """Category with its subcategories (GET /categories/tree)."""
+
+    id: int
+    name: str
+    slug: str
+    product_count: int = 0  # active products directly in this category
+    subtree_product_count: int = 0  # ... in this category and all its descendants
+    children: list["CategoryTreeNode"] = Field(default_factory=list)
 
 
 class CategoryListResponse(BaseModel):
@@ -74,10 +74,29 @@ class OrderRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class OrderSummary(BaseModel):
+    """Order history row with per-order aggregates instead of items (list_orders?view=summary)."""
+
+    id: int
+    status: str
+    total_amount: Decimal
+    payment_method: str
+    created_at: datetime
+    item_count: int  # line items
+    total_quantity: int  # units across all lines
+    # First line item (lowest id), for the history thumbnail
+    first_item_name: str | None = None
+    first_item_image: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class OrderListResponse(BaseModel):
-    """Paginated list of orders."""
+    """Paginated list of orders (full OrderRead or OrderSummary items, per `view`)."""
 
-    total: int
-    items: list[OrderRead]
+    total: int | None  # None when the client asked for count=none
+    items: list[OrderRead] | list[OrderSummary]
     page: int
     size: int
+    # Opaque keyset cursor for the next page; None on the last page
+    next_cursor: str | None = None
@@ -4,6 +4,7 @@ Product API schemas – create, read, update, paginated list.
 
 from datetime import datetime
 from decimal import Decimal
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -52,6 +53,8 @@ class ProductRead(ProductBase):
     """Response schema for a single product (with optional category)."""
 
     id: int
+    effective_price: Decimal  # charged at checkout: discount_price if set (non-zero), else price
+    stock_sharded: bool = False  # stock kept in shard rows (flash-sale mode); stock is their sum
     created_at: datetime
     updated_at: datetime
     category: CategoryRead | None = None
@@ -59,10 +62,109 @@ class ProductRead(ProductBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProductSummary(BaseModel):
+    """Grid-card representation of a product (list_products?view=summary)."""
+
+    id: int
+    slug: str
+    name: str
+    price: Decimal
+    discount_price: Decimal | None = None
+    effective_price: Decimal
+    image: str | None = None  # first image
+    in_stock: bool
+    category_slug: str
+    category_name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SuggestionRead(BaseModel):
+    """One typeahead suggestion: a product or a category (link by slug)."""
+
+    kind: Literal["category", "product"]
+    name: str
+    slug: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class ProductListResponse(BaseModel):
-    """Paginated list of products."""
+    """Paginated list of products (full ProductRead or ProductSummary items, per `view`)."""
 
-    total: int
-    items: list[ProductRead]
+    total: int | None  # None when the client asked for count=none
+    items: list[ProductRead] | list[ProductSummary]
     page: int
     size: int
+    # Opaque keyset cursor for the next page; None on the last page
+    next_cursor: str | None = None
+
+
+class ProductBatchRequest(BaseModel):
+    """Ids and/or slugs to hydrate in one call (e.g. the items of a client-side cart)."""
+
+    ids: list[int] = Field(default_factory=list)
+    slugs: list[str] = Field(default_factory=list)
+
+
+class ProductStockShardsUpdate(BaseModel):
+    """Admin request to split a product's stock across shard rows."""
+
+    shards: int = Field(8, ge=2, le=64)
+
+
+class ProductCartLine(BaseModel):
+    """Fields needed to price and render a cart or wishlist line."""
+
+    id: int
+    slug: str
+    name: str
+    price: Decimal
+    discount_price: Decimal | None = None
+    unit_price: Decimal  # what checkout charges (Product.effective_price)
+    image: str | None = None
+    stock: int
+    available: int  # stock minus units held by active cart reservations
+    sizes: list[str] = Field(default_factory=list)
+    colors: list[str] = Field(default_factory=list)
+
+
+class ProductBatchResponse(BaseModel):
+    """Active products found for a batch request; unknown or inactive ones are listed as missing."""
+
+    items: list[ProductCartLine]
+    missing_ids: list[int] = Field(default_factory=list)
+    missing_slugs: list[str] = Field(default_factory=list)
+
+
+class FacetValueCount(BaseModel):
+    """Number of matching products offering one size or color."""
+
+    value: str
+    count: int
+
+
+class CategoryFacetCount(BaseModel):
+    """Number of matching products in one category."""
+
+    slug: str
+    name: str
+    count: int
+
+
+class PriceBucketCount(BaseModel):
+    """Number of matching products priced in [min_price, max_price); max_price None = open-ended."""
+
+    min_price: Decimal
+    max_price: Decimal | None = None
+    count: int
+
+
+class ProductFacets(BaseModel):
+    """Facet counts over a filtered product set (for filter sidebars)."""
+
+    total: int
+    categories: list[CategoryFacetCount]
+    price_buckets: list[PriceBucketCount]
+    sizes: list[FacetValueCount]
+    colors: list[FacetValueCount]
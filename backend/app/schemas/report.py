@@ -0,0 +1,39 @@
+"""
+Sales report schemas – admin reporting endpoints served from the daily rollups.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SalesTotals(BaseModel):
+    """Revenue (sum of price_at_purchase × quantity), units sold and orders placed."""
+
+    revenue: Decimal
+    units: int
+    orders: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DailySales(SalesTotals):
+    """Totals for one UTC day (store-wide, or for one product)."""
+
+    day: date
+
+
+class CategorySales(SalesTotals):
+    """Totals for one category over the requested range."""
+
+    category_id: int
+    category_name: str | None = None  # None if the category was deleted since
+
+
+class ProductSales(SalesTotals):
+    """Totals for one product over the requested range (top sellers)."""
+
+    product_id: int
+    product_name: str | None = None
+    product_slug: str | None = None
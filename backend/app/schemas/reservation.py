@@ -0,0 +1,24 @@
+"""
+Stock reservation API schemas – hold request and read.
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ReservationCreate(BaseModel):
+    """Hold quantity units of a product (replaces the user's existing hold and restarts its TTL)."""
+
+    product_id: int = Field(..., gt=0)
+    quantity: int = Field(..., gt=0)
+
+
+class ReservationRead(BaseModel):
+    """An active hold; checkout converts it into a stock decrement."""
+
+    product_id: int
+    quantity: int
+    expires_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -17,3 +17,9 @@ class WishlistRead(BaseModel):
     product: ProductRead
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class WishlistIds(BaseModel):
+    """Wishlisted product ids: the whole wishlist (/wishlist/ids) or the asked-for subset (/contains)."""
+
+    product_ids: list[int]
@@ -28,6 +28,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import async_session_maker
 from app.models.category import Category
 from app.models.product import Product
+from app.services.category_counts import recompute_category_counts
+from app.services.category_paths import assign_path
+from app.services.http_cache import bump_catalog_version
 
 
 # ---------------------------------------------------------------------------
@@ -125,6 +128,7 @@ async def seed_categories(session: AsyncSession) -> dict[str, int]:
             slug=row["slug"],
             description=row.get("description"),
         )
+        await assign_path(session, cat)
         session.add(cat)
         await session.flush()
         slug_to_id[row["slug"]] = cat.id
@@ -161,6 +165,10 @@ async def seed_products(session: AsyncSession, slug_to_id: dict[str, int]) -> No
             is_active=True,
         )
         session.add(product)
+    await session.flush()
+    await recompute_category_counts(session)
+    # Catalog changed outside the admin API: invalidate clients' cached listings
+    await bump_catalog_version(session)
     await session.commit()
 
 
@@ -1,12 +1,14 @@
 import json
 from typing import List, Optional
 import google.generativeai as genai
+from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from app.config import settings
 from app.models.product import Product
 from app.schemas.ai import StylistRequest, StylistRecommendation, StylistResponse
+from app.services.search import search_filter
 
 class AIService:
     def __init__(self):
@@ -26,11 +28,11 @@ class AIService:
             # We filter by gender and partially by occasion keywords to reduce noise
             conditions = [Product.is_active == True]
             
-            # Simple gender filtering
+            # Simple gender filtering (full-text, so "men" no longer matches "women")
             if request.gender.lower() == "male":
-                conditions.append(Product.name.ilike("%men%") | Product.description.ilike("%men%"))
+                conditions.append(search_filter("men", fuzzy=False))
             elif request.gender.lower() == "female":
-                conditions.append(Product.name.ilike("%women%") | Product.description.ilike("%women%") | Product.name.ilike("%lady%") | Product.name.ilike("%girl%"))
+                conditions.append(or_(*(search_filter(t, fuzzy=False) for t in ("women", "lady", "girl"))))
             
             # Budget filtering
             if request.budget_max:
@@ -0,0 +1,140 @@
+"""
+In-process TTL cache with LRU eviction.
+
+Entries live for ttl seconds and the least recently used entry is evicted once
+max_entries is reached. Keys are tuples so related entries can be dropped
+together with discard_prefix(); each API worker process has its own cache.
+
+get_or_load() coalesces concurrent misses for the same key into a single load,
+and a load that started before an invalidation never stores its (stale) result.
+Every named cache is registered in `caches` so its stats can be inspected.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+_MISSING = object()
+
+# name -> cache, for stats reporting
+caches: dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """Bounded LRU mapping of tuple keys to values that expire after ttl seconds."""
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 1024) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        # Bumped on every invalidation; loads that span one don't store their result
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        caches[name] = self
+
+    def get(self, key: tuple[Hashable, ...], default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: tuple[Hashable, ...], value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(
+        self,
+        key: tuple[Hashable, ...],
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Cached value for key, calling loader() on a miss.
+
+        Concurrent callers missing on the same key wait for the first caller's
+        load instead of running their own. None results are returned but not cached.
+        """
+        while True:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leading request was cancelled, not us: load it ourselves
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved so asyncio doesn't warn when nobody was waiting
+            future.add_done_callback(lambda f: f.exception())
+            raise
+        finally:
+            del self._inflight[key]
+        if value is not None and generation == self._generation:
+            self.set(key, value)
+        future.set_result(value)
+        return value
+
+    def discard(self, key: tuple[Hashable, ...]) -> None:
+        self._generation += 1
+        self._entries.pop(key, None)
+
+    def discard_prefix(self, *prefix: Hashable) -> None:
+        """Drop every entry whose key starts with prefix (all entries if prefix is empty)."""
+        self._generation += 1
+        n = len(prefix)
+        for key in [k for k in self._entries if k[:n] == prefix]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Counters since process start plus the current entry count."""
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,60 @@
+"""
+Read cache for catalog detail and category endpoints.
+
+The catalog only changes through the admin endpoints, so serialized ProductRead /
+CategoryRead payloads are cached in process and dropped by those endpoints on
+write (other workers converge within CATALOG_CACHE_TTL_SECONDS). Stock changes
+with every order, so get_product_by_slug reads it live on top of the cached body.
+Category and facet bodies are served under an ETag built from the catalog version,
+so their keys include that version: a worker that has not seen another worker's
+write yet can never pair the new ETag with its old body.
+
+Keys:
+  product_cache:  ("slug", slug)                 -> ProductRead (active products only)
+  category_cache: ("slug", slug, version)        -> CategoryReadWithCount
+                  ("list", parent_id, version)   -> list[CategoryRead]
+                  ("tree", version)              -> list[CategoryTreeNode]
+                  ("path", slug)                 -> materialized path (include_descendants)
+  facet_cache:    (filter signature, version)    -> ProductFacets
+"""
+
+from app.config import settings
+from app.services.cache import TTLCache
+from app.services.counting import invalidate_counts
+
+product_cache = TTLCache(
+    "products",
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+)
+category_cache = TTLCache(
+    "categories",
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+)
+
+facet_cache = TTLCache(
+    "facets",
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+)
+
+
+def invalidate_product(*slugs: str) -> None:
+    """Drop cached reads of one product (pass old and new slug on rename) and listing totals."""
+    for slug in slugs:
+        product_cache.discard(("slug", slug))
+    # Category detail and tree embed product counts
+    category_cache.discard_prefix("slug")
+    category_cache.discard_prefix("tree")
+    facet_cache.clear()
+    invalidate_counts("product")
+
+
+def invalidate_categories() -> None:
+    """Drop all category reads, and product reads since ProductRead embeds its category."""
+    category_cache.clear()
+    product_cache.clear()
+    facet_cache.clear()
+    # category_slug filters may now match different products
+    invalidate_counts("product")
@@ -0,0 +1,91 @@
+"""
+Denormalized active-product counters on category.
+
+category.product_count counts active products directly in a category and
+category.subtree_product_count also counts those in all its descendants, so
+count reads are a column lookup instead of a COUNT over product.
+
+Admin product writes adjust the counters in their own transaction
+(update_category_counts); category moves and deletes, the seed script and
+scripts/reconcile_category_counts.py recompute them in bulk.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Category id and its ancestors; UNION (not ALL) stops on an accidental parent cycle
+_ADJUST_SQL = text(
+    """
+    WITH RECURSIVE chain(id) AS (
+        SELECT CAST(:category_id AS integer)
+        UNION
+        SELECT c.parent_id FROM category c JOIN chain ON c.id = chain.id
+        WHERE c.parent_id IS NOT NULL
+    )
+    UPDATE category
+    SET subtree_product_count = subtree_product_count + :delta,
+        product_count = product_count + CASE WHEN id = :category_id THEN :delta ELSE 0 END
+    WHERE id IN (SELECT id FROM chain)
+    """
+)
+
+# Every (category, ancestor-or-self) pair, then direct and rolled-up counts;
+# only rows whose counters drifted are written
+_RECOMPUTE_SQL = text(
+    """
+    WITH RECURSIVE lineage(category_id, ancestor_id) AS (
+        SELECT id, id FROM category
+        UNION
+        SELECT l.category_id, c.parent_id
+        FROM lineage l JOIN category c ON c.id = l.ancestor_id
+        WHERE c.parent_id IS NOT NULL
+    ),
+    direct AS (
+        SELECT category_id, count(*) AS n FROM product WHERE is_active GROUP BY category_id
+    ),
+    rolled AS (
+        SELECT l.ancestor_id AS id, sum(d.n) AS n
+        FROM lineage l JOIN direct d ON d.category_id = l.category_id
+        GROUP BY l.ancestor_id
+    ),
+    fresh AS (
+        SELECT c.id,
+               coalesce(d.n, 0) AS product_count,
+               coalesce(r.n, 0) AS subtree_product_count
+        FROM category c
+        LEFT JOIN direct d ON d.category_id = c.id
+        LEFT JOIN rolled r ON r.id = c.id
+    )
+    UPDATE category
+    SET product_count = fresh.product_count,
+        subtree_product_count = fresh.subtree_product_count
+    FROM fresh
+    WHERE category.id = fresh.id
+      AND (category.product_count, category.subtree_product_count)
+          IS DISTINCT FROM (fresh.product_count, fresh.subtree_product_count)
+    RETURNING category.id
+    """
+)
+
+# (category_id, is_active) of a product before or after a write; None if it doesn't exist
+ProductPlacement = tuple[int, bool] | None
+
+
+async def update_category_counts(
+    db: AsyncSession,
+    before: ProductPlacement,
+    after: ProductPlacement,
+) -> None:
+    """Move one product's contribution from `before` to `after`; call before commit."""
+    if before == after:
+        return
+    if before is not None and before[1]:
+        await db.execute(_ADJUST_SQL, {"category_id": before[0], "delta": -1})
+    if after is not None and after[1]:
+        await db.execute(_ADJUST_SQL, {"category_id": after[0], "delta": 1})
+
+
+async def recompute_category_counts(db: AsyncSession) -> int:
+    """Recompute every category's counters from product; returns how many rows were corrected."""
+    result = await db.execute(_RECOMPUTE_SQL)
+    return len(result.all())
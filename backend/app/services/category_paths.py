@@ -0,0 +1,79 @@
+"""
+Materialized category paths for subtree queries.
+
+category.path lists the ids from the root down to the category itself,
+e.g. "/1/5/9/" for category 9 under 5 under root 1, so "all descendants of 5"
+is the prefix range "/1/5/" on one index (ix_category_path, varchar_pattern_ops)
+instead of a recursive walk. Paths are maintained by the admin category
+endpoints through the helpers below.
+"""
+
+from fastapi import HTTPException
+from sqlalchemy import ColumnElement, and_, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+
+
+def subtree_filter(path: str) -> ColumnElement[bool]:
+    """Categories at or below the one with this path.
+
+    Written as a range with the pattern operators (~>=~ / ~<~) rather than
+    LIKE 'path%', so the index is used even when the plan is generic over a bind
+    parameter. "0" sorts right after "/", which closes the range.
+    """
+    return and_(
+        Category.path.op("~>=~")(path),
+        Category.path.op("~<~")(path[:-1] + "0"),
+    )
+
+
+async def _parent_path(db: AsyncSession, parent_id: int | None) -> str:
+    if parent_id is None:
+        return "/"
+    path = (await db.execute(select(Category.path).where(Category.id == parent_id))).scalar()
+    if path is None:
+        raise HTTPException(status_code=400, detail="Parent category not found")
+    return path
+
+
+async def assign_path(db: AsyncSession, category: Category) -> None:
+    """Set path on a new category; reserves its id from the sequence first."""
+    if category.id is None:
+        category.id = (
+            await db.execute(select(func.nextval(func.pg_get_serial_sequence("category", "id"))))
+        ).scalar_one()
+    category.path = f"{await _parent_path(db, category.parent_id)}{category.id}/"
+
+
+async def move_category(db: AsyncSession, category: Category, parent_id: int | None) -> None:
+    """Re-parent category and rewrite the paths of its whole subtree (one UPDATE)."""
+    new_path = f"{await _parent_path(db, parent_id)}{category.id}/"
+    old_path = category.path
+    if new_path.startswith(old_path) and new_path != old_path:
+        raise HTTPException(status_code=400, detail="Cannot move a category under its own subcategory")
+    category.parent_id = parent_id
+    await _rewrite_subtree(db, old_path, new_path)
+    category.path = new_path
+
+
+async def detach_children(db: AsyncSession, category: Category) -> None:
+    """Before deleting category: its children become roots (parent_id SET NULL), so re-root their paths."""
+    # "/1/5/9/12/" -> "/9/12/" when deleting 5
+    await _rewrite_subtree(db, category.path, "/", include_root=False)
+
+
+async def _rewrite_subtree(
+    db: AsyncSession,
+    old_prefix: str,
+    new_prefix: str,
+    include_root: bool = True,
+) -> None:
+    q = update(Category).where(subtree_filter(old_prefix))
+    if not include_root:
+        q = q.where(Category.path != old_prefix)
+    await db.execute(
+        q.values(path=new_prefix + func.substr(Category.path, len(old_prefix) + 1)).execution_options(
+            synchronize_session=False
+        )
+    )
@@ -0,0 +1,62 @@
+"""
+Whole category hierarchy in one statement.
+
+A recursive CTE walks category.parent_id from the roots, carrying its name path
+for sibling order; product counts are the maintained category counters
+(services/category_counts.py). The nested tree is assembled in one pass over the rows.
+"""
+
+from sqlalchemy import Text, cast, select
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.schemas.category import CategoryTreeNode
+
+
+def _tree_query():
+    roots = select(
+        Category.id,
+        Category.parent_id,
+        Category.name,
+        Category.slug,
+        Category.product_count,
+        Category.subtree_product_count,
+        array([cast(Category.name, Text)], type_=ARRAY(Text)).label("sort_path"),
+    ).where(Category.parent_id.is_(None))
+    tree = roots.cte("tree", recursive=True)
+    child = select(Category).subquery("child")
+    tree = tree.union_all(
+        select(
+            child.c.id,
+            child.c.parent_id,
+            child.c.name,
+            child.c.slug,
+            child.c.product_count,
+            child.c.subtree_product_count,
+            tree.c.sort_path.concat(cast(child.c.name, Text)),
+        ).join(tree, child.c.parent_id == tree.c.id)
+    )
+    return select(tree).order_by(tree.c.sort_path)
+
+
+async def load_category_tree(db: AsyncSession) -> list[CategoryTreeNode]:
+    """Root categories with nested children, sorted by name at every level."""
+    result = await db.execute(_tree_query())
+    nodes: dict[int, CategoryTreeNode] = {}
+    roots: list[CategoryTreeNode] = []
+    # Rows come parents-first (sort_path order), so every parent is already built
+    for row in result.all():
+        node = CategoryTreeNode(
+            id=row.id,
+            name=row.name,
+            slug=row.slug,
+            product_count=row.product_count,
+            subtree_product_count=row.subtree_product_count,
+        )
+        nodes[row.id] = node
+        if row.parent_id is None:
+            roots.append(node)
+        else:
+            nodes[row.parent_id].children.append(node)
+    return roots
@@ -0,0 +1,153 @@
+"""
+Checkout – turn a cart into an order in a fixed number of round-trips.
+
+All cart products are read in one SELECT ... WHERE id = ANY(...) ORDER BY id
+FOR UPDATE. Locking in id order means two checkouts that share products always
+queue on the same row first instead of deadlocking, and a checkout that has its
+locks sees stock no one else can change before it commits. Stock is then
+decremented for every line with a single UPDATE ... FROM (VALUES ...) guarded
+by stock >= qty, so an oversell is impossible even if the checks above change.
+
+Units held for other shoppers (services/reservations.py) are not available to
+the buyer; the buyer's own holds are consumed by the order and deleted.
+
+Products with sharded stock (services/stock_shards.py) are read without a row
+lock and decremented on one of their shard rows instead of product.stock.
+"""
+
+from collections import Counter
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import Integer, any_, column, literal, select, update, values
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.address import Address
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.schemas.order import OrderCreate
+from app.services.reservations import holds_by_product, release
+from app.services.stock_shards import take_sharded_stock
+
+
+async def _lock_products(db: AsyncSession, ids: list[int]) -> dict[int, Product]:
+    """Active-or-not products for ids; unsharded ones row-locked in id order.
+
+    Sharded products are fetched by a second, lock-free query, only when the
+    cart has ids the first one didn't return.
+    """
+    result = await db.execute(
+        select(Product)
+        .where(Product.id == any_(literal(ids, ARRAY(Integer))), Product.stock_sharded.is_(False))
+        .order_by(Product.id)
+        .with_for_update()
+    )
+    products = {p.id: p for p in result.scalars().all()}
+    rest = [i for i in ids if i not in products]
+    if rest:
+        result = await db.execute(select(Product).where(Product.id == any_(literal(rest, ARRAY(Integer)))))
+        products.update((p.id, p) for p in result.scalars().all())
+    return products
+
+
+async def _decrement_stock(db: AsyncSession, quantities: dict[int, int]) -> None:
+    """Subtract quantities from stock in one statement; 409 if any row lacks stock."""
+    wanted = values(column("id", Integer), column("qty", Integer), name="wanted").data(
+        sorted(quantities.items())
+    )
+    result = await db.execute(
+        update(Product)
+        .where(Product.id == wanted.c.id, Product.stock >= wanted.c.qty)
+        .values(stock=Product.stock - wanted.c.qty)
+        .returning(Product.id)
+        .execution_options(synchronize_session=False)
+    )
+    if len(result.all()) != len(quantities):
+        raise HTTPException(status_code=409, detail="Stock changed during checkout, please retry")
+
+
+async def place_order(db: AsyncSession, user_id: int, body: OrderCreate) -> Order:
+    """Validate the cart, reserve stock and add the order to the session (caller commits).
+
+    The returned order has its items (with product display snapshots) and the
+    shipping address attached in memory, so it can be serialized after commit
+    without re-reading.
+
+    Raises 404 for a foreign/missing address and 400 for unknown, inactive or
+    out-of-stock products, leaving the transaction to be rolled back.
+    """
+    address = (
+        await db.execute(
+            select(Address).where(
+                Address.id == body.shipping_address_id,
+                Address.user_id == user_id,
+            )
+        )
+    ).scalar_one_or_none()
+    if not address:
+        raise HTTPException(status_code=404, detail="Shipping address not found")
+
+    # The same product can appear on several lines (e.g. two sizes)
+    quantities: Counter[int] = Counter()
+    for line in body.items:
+        quantities[line.product_id] += line.quantity
+
+    products = await _lock_products(db, sorted(quantities))
+    holds = await holds_by_product(db, user_id, list(quantities))
+    for product_id, quantity in quantities.items():
+        product = products.get(product_id)
+        if not product or not product.is_active:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Product ID {product_id} not found or inactive",
+            )
+        _, held_by_others = holds.get(product_id, (0, 0))
+        # For sharded products stock is the synced shard sum; the shard decrement is authoritative
+        available = product.stock - held_by_others
+        if available < quantity:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Insufficient stock for '{product.name}' (available: {max(available, 0)}, requested: {quantity})",
+            )
+    sharded = {i: q for i, q in quantities.items() if products[i].stock_sharded}
+    if len(sharded) < len(quantities):
+        await _decrement_stock(db, {i: q for i, q in quantities.items() if i not in sharded})
+    for product_id, quantity in sorted(sharded.items()):
+        await take_sharded_stock(db, product_id, quantity, products[product_id].name)
+    held_by_buyer = [product_id for product_id, (mine, _) in holds.items() if mine]
+    if held_by_buyer:
+        await release(db, user_id, held_by_buyer)
+
+    total = Decimal("0")
+    order_items: list[OrderItem] = []
+    for line in body.items:
+        product = products[line.product_id]
+        # Discount price if set, else regular price (generated column)
+        unit_price = product.effective_price
+        total += unit_price * line.quantity
+        order_items.append(
+            OrderItem(
+                product_id=product.id,
+                # Snapshot, so order history survives product renames and is read without a join
+                product_name=product.name,
+                product_slug=product.slug,
+                product_image=product.images[0] if product.images else None,
+                quantity=line.quantity,
+                price_at_purchase=unit_price,
+                size=line.size,
+                color=line.color,
+            )
+        )
+
+    order = Order(
+        user_id=user_id,
+        status="pending",
+        total_amount=total,
+        shipping_address=address,
+        payment_method=body.payment_method,
+        items=order_items,
+    )
+    db.add(order)
+    return order
@@ -0,0 +1,110 @@
+"""
+Total-count strategies for paginated listings.
+
+A separate SELECT count(*) before every page doubles round-trips and re-runs the
+whole filter. Listings take a `count` mode instead:
+
+- exact:     count(*) OVER () added to the page query itself (one round-trip).
+             In cursor mode the window would only see rows after the cursor,
+             so the exact total is computed once per filter and cached.
+- cached:    exact total cached per (scope, filter signature) for a short TTL;
+             product writes invalidate the "product" scope.
+- estimated: planner row estimate (pg_class.reltuples) for unfiltered listings
+             above COUNT_ESTIMATE_MIN_ROWS; falls back to cached otherwise.
+- none:      no total at all (total is null in the response).
+"""
+
+from collections.abc import Hashable, Sequence
+from typing import Any, Literal
+
+from sqlalchemy import Row, Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.cache import TTLCache
+
+CountMode = Literal["exact", "cached", "estimated", "none"]
+
+# (scope, signature) -> total; scopes: "product", "order:<user_id>"
+count_cache = TTLCache("counts", ttl=settings.COUNT_CACHE_TTL_SECONDS, max_entries=4096)
+
+_TOTAL_LABEL = "total_count"
+
+
+def filter_signature(**filters: Any) -> tuple[tuple[str, str], ...]:
+    """Normalized, hashable form of the filters that affect a total (None values dropped)."""
+    return tuple(sorted((k, str(v)) for k, v in filters.items() if v is not None))
+
+
+class TotalCounter:
+    """Resolves the `total` of one listing request according to its count mode.
+
+    Call apply() on the page query, execute it, then pass its rows to total().
+    """
+
+    def __init__(
+        self,
+        mode: CountMode,
+        scope: str,
+        signature: tuple[Hashable, ...],
+        *,
+        first_page: bool,
+        cursor: bool = False,
+        estimate_relation: str | None = None,
+    ) -> None:
+        self.mode = mode
+        self.scope = scope
+        self.signature = signature
+        self.first_page = first_page
+        # Relation whose reltuples approximates the total (table or partial index);
+        # only meaningful for unfiltered listings, so callers pass it only then
+        self.estimate_relation = estimate_relation
+        self.in_query = mode == "exact" and not cursor
+
+    def apply(self, q: Select) -> Select:
+        """Add the count(*) OVER () column to the page query when counting in-query."""
+        if self.in_query:
+            return q.add_columns(func.count().over().label(_TOTAL_LABEL))
+        return q
+
+    async def total(self, db: AsyncSession, base_q: Select, rows: Sequence[Row]) -> int | None:
+        """Total matching rows for base_q (the filtered query without ordering/paging)."""
+        if self.mode == "none":
+            return None
+        if self.in_query:
+            if rows:
+                return rows[0]._mapping[_TOTAL_LABEL]
+            if self.first_page:
+                return 0
+            # Page past the end: the window had no rows to report on
+            return await self._count(db, base_q)
+        if self.mode == "estimated" and self.estimate_relation:
+            estimate = await _reltuples(db, self.estimate_relation)
+            if estimate >= settings.COUNT_ESTIMATE_MIN_ROWS:
+                return estimate
+        return await self._cached_count(db, base_q)
+
+    async def _cached_count(self, db: AsyncSession, base_q: Select) -> int:
+        return await count_cache.get_or_load(
+            (self.scope, self.signature), lambda: self._count(db, base_q)
+        )
+
+    @staticmethod
+    async def _count(db: AsyncSession, base_q: Select) -> int:
+        result = await db.execute(select(func.count()).select_from(base_q.subquery()))
+        return result.scalar() or 0
+
+
+async def _reltuples(db: AsyncSession, relation: str) -> int:
+    """Planner row estimate for a table or index; -1 if never analyzed."""
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:rel)"),
+        {"rel": relation},
+    )
+    estimate = result.scalar()
+    return -1 if estimate is None else int(estimate)
+
+
+def invalidate_counts(scope: str) -> None:
+    """Drop cached totals for a scope after a write that changes them."""
+    count_cache.discard_prefix(scope)
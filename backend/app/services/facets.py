@@ -0,0 +1,96 @@
+"""
+Facet counts for the product listing filters.
+
+All facets are computed by one statement: the filtered products are materialized
+once in a CTE and each facet is a GROUP BY over it, UNION ALL-ed together.
+Sizes and colors are JSONB arrays, expanded with jsonb_array_elements_text.
+"""
+
+from collections.abc import Sequence
+from decimal import Decimal
+
+from sqlalchemy import ColumnElement, String, cast, func, literal, null, select, true, union_all
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.sql.selectable import CompoundSelect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.models.product import Product
+from app.schemas.product import (
+    CategoryFacetCount,
+    FacetValueCount,
+    PriceBucketCount,
+    ProductFacets,
+)
+
+# Lower bounds (PKR) of the effective-price buckets; the last bucket is open-ended
+PRICE_BUCKET_BOUNDS: tuple[Decimal, ...] = tuple(
+    Decimal(b) for b in ("0", "2000", "5000", "10000", "20000")
+)
+
+
+def _facets_query(conditions: Sequence[ColumnElement[bool]]) -> CompoundSelect:
+    """(facet, value, label, count) rows for every facet, as one UNION ALL statement."""
+    filtered = (
+        select(Product.category_id, Product.effective_price, Product.sizes, Product.colors)
+        .where(*conditions)
+        .cte("filtered")
+    )
+    # width_bucket(x, thresholds) = number of thresholds <= x, i.e. the bucket index
+    bucket = func.width_bucket(filtered.c.effective_price, array(PRICE_BUCKET_BOUNDS[1:]))
+    sizes = func.jsonb_array_elements_text(filtered.c.sizes).table_valued("value").alias("s")
+    colors = func.jsonb_array_elements_text(filtered.c.colors).table_valued("value").alias("c")
+
+    return union_all(
+        select(literal("category"), Category.slug, Category.name, func.count())
+        .select_from(filtered)
+        .join(Category, Category.id == filtered.c.category_id)
+        .group_by(Category.slug, Category.name),
+        select(literal("price"), cast(bucket, String), null(), func.count())
+        .select_from(filtered)
+        .group_by(bucket),
+        select(literal("size"), sizes.c.value, null(), func.count())
+        .select_from(filtered)
+        .join(sizes, true())
+        .group_by(sizes.c.value),
+        select(literal("color"), colors.c.value, null(), func.count())
+        .select_from(filtered)
+        .join(colors, true())
+        .group_by(colors.c.value),
+    )
+
+
+async def compute_facets(db: AsyncSession, conditions: Sequence[ColumnElement[bool]]) -> ProductFacets:
+    """Category, price bucket, size and color counts over products matching conditions."""
+    result = await db.execute(_facets_query(conditions))
+
+    categories: list[CategoryFacetCount] = []
+    bucket_counts: dict[int, int] = {}
+    size_counts: list[FacetValueCount] = []
+    color_counts: list[FacetValueCount] = []
+    for facet, value, label, count in result.all():
+        if facet == "category":
+            categories.append(CategoryFacetCount(slug=value, name=label, count=count))
+        elif facet == "price":
+            bucket_counts[int(value)] = count
+        elif facet == "size":
+            size_counts.append(FacetValueCount(value=value, count=count))
+        else:
+            color_counts.append(FacetValueCount(value=value, count=count))
+
+    bounds = PRICE_BUCKET_BOUNDS
+    return ProductFacets(
+        # Every product is in exactly one category
+        total=sum(c.count for c in categories),
+        categories=sorted(categories, key=lambda c: (-c.count, c.name)),
+        price_buckets=[
+            PriceBucketCount(
+                min_price=bounds[i],
+                max_price=bounds[i + 1] if i + 1 < len(bounds) else None,
+                count=bucket_counts.get(i, 0),
+            )
+            for i in range(len(bounds))
+        ],
+        sizes=sorted(size_counts, key=lambda f: (-f.count, f.value)),
+        colors=sorted(color_counts, key=lambda f: (-f.count, f.value)),
+    )
@@ -0,0 +1,145 @@
+"""
+HTTP validators for catalog endpoints: ETag / Last-Modified, 304 responses, Cache-Control.
+
+Detail responses are validated by the row's own updated_at. Listings are validated
+by the catalog-wide version in catalog_state, which every admin product/category
+write bumps in the same transaction, so a revalidation costs one primary-key read
+instead of re-running and re-serializing the listing query.
+
+Product listings also show stock, which changes with every order, so their ETag
+adds the catalog_stock_version sequence (advanced after checkouts and shard
+syncs commit) and they carry no Last-Modified. Category and facet responses
+don't depend on stock and keep the catalog version alone.
+"""
+
+import hashlib
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+from sqlalchemy import case, column, func, select, table, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.catalog_state import CatalogState, catalog_stock_version
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+async def get_catalog_version(db: AsyncSession) -> tuple[int, datetime]:
+    """Current (version, updated_at) of the catalog."""
+    result = await db.execute(
+        select(CatalogState.version, CatalogState.updated_at).where(CatalogState.id == 1)
+    )
+    row = result.one_or_none()
+    return (row.version, row.updated_at) if row else (0, _EPOCH)
+
+
+async def get_product_listing_version(db: AsyncSession) -> tuple[int, int]:
+    """Current (catalog version, stock version), in one query."""
+    # last_value is the start value until the first nextval; is_called tells them apart
+    stock_version = (
+        select(case((column("is_called"), column("last_value")), else_=0))
+        .select_from(table(catalog_stock_version.name))
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(CatalogState.version, stock_version).where(CatalogState.id == 1)
+    )
+    row = result.one_or_none()
+    return (row[0], row[1]) if row else (0, 0)
+
+
+async def bump_catalog_version(db: AsyncSession) -> None:
+    """Advance the catalog version; call inside the transaction of an admin catalog write."""
+    await db.execute(
+        update(CatalogState)
+        .where(CatalogState.id == 1)
+        .values(version=CatalogState.version + 1, updated_at=func.now())
+    )
+
+
+async def bump_stock_version(db: AsyncSession) -> None:
+    """Advance the stock version; call after committing a stock change.
+
+    nextval is not transactional: called before the commit, a revalidation could
+    pair the new version with the old stock. Commits the (otherwise empty) transaction.
+
+    Best effort: the stock change is already committed, so a failure here is logged
+    rather than raised (listings may answer 304 with the old stock until the next bump).
+    """
+    try:
+        await db.execute(select(catalog_stock_version.next_value()))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        logger.exception("Could not advance the stock version")
+
+
+def make_etag(*parts: object) -> str:
+    """Weak ETag over the given parts (weak: equal JSON, not byte-identical encoding)."""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def catalog_etag(request: Request, *versions: int) -> str:
+    """ETag for a catalog-derived response: version(s), path and normalized query string."""
+    return make_etag(request.url.path, *versions, sorted(request.query_params.multi_items()))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: datetime | None,
+) -> Response | None:
+    """Apply validators and caching headers.
+
+    Returns a 304 response if the client's copy is current (If-None-Match wins over
+    If-Modified-Since); otherwise sets the headers on response and returns None.
+    Without last_modified only the ETag validates.
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={settings.CATALOG_HTTP_MAX_AGE_SECONDS}, "
+            f"stale-while-revalidate={settings.CATALOG_HTTP_STALE_SECONDS}"
+        ),
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        fresh = (
+            last_modified is not None
+            and if_modified_since is not None
+            and _not_modified_since(if_modified_since, last_modified)
+        )
+    if fresh:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
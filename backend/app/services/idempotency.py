@@ -0,0 +1,96 @@
+"""
+Idempotency-Key support for non-repeatable POSTs (order placement).
+
+The key is claimed with INSERT ... ON CONFLICT DO NOTHING inside the same
+transaction that does the work, and the response is written to that row before
+commit. So:
+
+- a retry after success finds the committed row and replays its response without
+  redoing any work;
+- a duplicate sent while the first request is still running blocks on the
+  unique index until that transaction ends, then replays (commit) or proceeds
+  as the first attempt (rollback, e.g. a 400 that the client may fix and retry);
+- reusing a key with a different body is rejected with 422.
+
+Keys are scoped per user and purged after IDEMPOTENCY_KEY_TTL_HOURS.
+"""
+
+import hashlib
+from datetime import timedelta
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def request_fingerprint(body: BaseModel) -> str:
+    """sha256 of the request body in canonical JSON."""
+    return hashlib.sha256(body.model_dump_json().encode()).hexdigest()
+
+
+async def claim_key(
+    db: AsyncSession,
+    user_id: int,
+    key: str,
+    request_hash: str,
+) -> tuple[int, dict] | None:
+    """Claim key for this transaction, or return the stored (status_code, response) of an earlier use.
+
+    Waits for a concurrent request holding the same key to finish first.
+    """
+    claimed = await db.execute(
+        insert(IdempotencyKey)
+        .values(user_id=user_id, key=key, request_hash=request_hash)
+        .on_conflict_do_nothing(index_elements=["user_id", "key"])
+        .returning(IdempotencyKey.key)
+    )
+    if claimed.first() is not None:
+        return None
+    result = await db.execute(
+        select(IdempotencyKey.request_hash, IdempotencyKey.status_code, IdempotencyKey.response).where(
+            IdempotencyKey.user_id == user_id, IdempotencyKey.key == key
+        )
+    )
+    stored = result.one()
+    if stored.request_hash != request_hash:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{IDEMPOTENCY_HEADER} was already used with a different request",
+        )
+    if stored.response is None:
+        # Only possible if a row was committed without a response (written in one transaction)
+        raise HTTPException(status_code=409, detail=f"{IDEMPOTENCY_HEADER} is already in use")
+    return stored.status_code, stored.response
+
+
+async def store_response(
+    db: AsyncSession,
+    user_id: int,
+    key: str,
+    status_code: int,
+    response: BaseModel,
+) -> None:
+    """Record the response on the claimed key; call before the transaction commits."""
+    await db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        .values(status_code=status_code, response=response.model_dump(mode="json"))
+    )
+
+
+async def purge_expired_keys(db: AsyncSession) -> int:
+    """Delete keys older than IDEMPOTENCY_KEY_TTL_HOURS; returns how many."""
+    result = await db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.created_at < func.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        )
+    )
+    await db.commit()
+    return result.rowcount
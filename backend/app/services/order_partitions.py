@@ -0,0 +1,274 @@
+"""
+Monthly range partitions for "order" and order_item (optional, ORDER_PARTITIONING).
+
+When ORDER_PARTITIONING is set while migration 015 runs, or when
+`scripts/order_partitions.py partition` converts an existing database,
+"order" is partitioned by created_at and order_item by order_created_at (its
+order's created_at), one partition per calendar month in UTC: order_p202610 and
+order_item_p202610 hold October 2026. Queries with a created_at range (reports,
+recent history) only scan the months they cover, and old months can be
+detached or archived without touching the rest.
+
+There is no default partition, so a month needs its partitions before its first
+order. ensure_order_partitions() keeps ORDER_PARTITION_MONTHS_AHEAD months ready;
+it runs daily from the lifespan and from scripts/order_partitions.py. Without
+partitioning every function here is a no-op.
+"""
+
+from datetime import UTC, date, datetime
+
+from sqlalchemy import Connection, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+# Archived partitions are moved here (detach_order_partitions(archive=True))
+ARCHIVE_SCHEMA = "archive"
+
+# Partitioned tables; partitions are created in this order and detached in reverse
+_TABLES = ("order", "order_item")
+
+# pg_advisory_xact_lock key, so API workers and the script don't create the same partition at once
+_LOCK_KEY = 0x6F72646572
+
+# Rows copied per committed batch by convert_order_tables
+CONVERT_BATCH = 5000
+
+_IS_PARTITIONED = text(
+    "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('\"order\"'))"
+)
+
+
+def _add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def current_month() -> date:
+    """First day of the current month in UTC."""
+    today = datetime.now(UTC).date()
+    return today.replace(day=1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+async def is_partitioned(db: AsyncSession) -> bool:
+    """True if "order" is a partitioned table (migration 015 ran with ORDER_PARTITIONING)."""
+    result = await db.execute(_IS_PARTITIONED)
+    return result.scalar_one()
+
+
+async def list_partition_months(db: AsyncSession) -> list[date]:
+    """Months that have an attached "order" partition, oldest first."""
+    result = await db.execute(
+        text(
+            """
+            SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass('"order"')
+            """
+        )
+    )
+    return sorted(datetime.strptime(name[-6:], "%Y%m").date() for name in result.scalars())
+
+
+async def ensure_order_partitions(db: AsyncSession, months_ahead: int | None = None) -> int:
+    """Create missing partitions from this month to months_ahead months on; returns how many tables."""
+    if not await is_partitioned(db):
+        return 0
+    if months_ahead is None:
+        months_ahead = settings.ORDER_PARTITION_MONTHS_AHEAD
+    await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+    existing = set(await list_partition_months(db))
+    start = current_month()
+    created = 0
+    for n in range(months_ahead + 1):
+        month = _add_months(start, n)
+        if month in existing:
+            continue
+        bounds = f"FROM ('{month:%Y-%m-%d} 00:00+00') TO ('{_add_months(month, 1):%Y-%m-%d} 00:00+00')"
+        for table in _TABLES:
+            await db.execute(
+                text(f'CREATE TABLE "{partition_name(table, month)}" PARTITION OF "{table}" FOR VALUES {bounds}')
+            )
+            created += 1
+    await db.commit()
+    return created
+
+
+async def detach_order_partitions(db: AsyncSession, before: date, archive: bool = False) -> list[str]:
+    """Detach all partitions for months before `before`; returns the detached table names.
+
+    Detached tables keep their rows as plain tables (moved to ARCHIVE_SCHEMA when
+    archive=True) and no longer show up in order reads. Raises ValueError for the
+    current month or later.
+    """
+    if not await is_partitioned(db):
+        return []
+    if before > current_month():
+        raise ValueError("Cannot detach the current or a future month")
+    await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+    if archive:
+        await db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{ARCHIVE_SCHEMA}"'))
+    detached: list[str] = []
+    for month in await list_partition_months(db):
+        if month >= before:
+            break
+        # Items first: "order" rows can only leave once nothing in order_item references them
+        for table in reversed(_TABLES):
+            name = partition_name(table, month)
+            await db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+            if table == "order_item":
+                # The detached table keeps a copy of the foreign key to "order"; drop it
+                fks = await db.execute(
+                    text(
+                        """
+                        SELECT conname FROM pg_constraint
+                        WHERE conrelid = to_regclass(:name) AND contype = 'f'
+                          AND confrelid = to_regclass('"order"')
+                        """
+                    ),
+                    {"name": f'"{name}"'},
+                )
+                for fk in fks.scalars().all():
+                    await db.execute(text(f'ALTER TABLE "{name}" DROP CONSTRAINT "{fk}"'))
+            if archive:
+                await db.execute(text(f'ALTER TABLE "{name}" SET SCHEMA "{ARCHIVE_SCHEMA}"'))
+            detached.append(name)
+    await db.commit()
+    return detached
+
+
+def swap_order_tables_sql(partitioned: bool, months_ahead: int) -> str:
+    """One atomic DO block: move order/order_item aside as *_legacy and create empty new tables.
+
+    The new tables copy the legacy columns and defaults (LIKE), get primary keys and
+    the order_item -> "order" foreign key for the target layout, and then every
+    other index and foreign key the legacy tables had, so the conversion works at
+    any schema revision. With partitioned=True, monthly partitions are created
+    from the oldest order to months_ahead months ahead.
+    """
+    order_key, item_key, item_fk = (
+        ("id, created_at", "id, order_created_at", "(order_id, order_created_at) REFERENCES \"order\" (id, created_at)")
+        if partitioned
+        else ("id", "id", "(order_id) REFERENCES \"order\" (id)")
+    )
+    order_partition_by = " PARTITION BY RANGE (created_at)" if partitioned else ""
+    item_partition_by = " PARTITION BY RANGE (order_created_at)" if partitioned else ""
+    partitions = f"""
+        month := date_trunc('month', coalesce((SELECT min(created_at) FROM order_legacy), now()) AT TIME ZONE 'UTC');
+        last_month := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{int(months_ahead)} months';
+        WHILE month <= last_month LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF "order" FOR VALUES FROM (%L) TO (%L)',
+                'order_p' || to_char(month, 'YYYYMM'),
+                month || ' 00:00+00',
+                (month + interval '1 month')::date || ' 00:00+00'
+            );
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF order_item FOR VALUES FROM (%L) TO (%L)',
+                'order_item_p' || to_char(month, 'YYYYMM'),
+                month || ' 00:00+00',
+                (month + interval '1 month')::date || ' 00:00+00'
+            );
+            month := month + interval '1 month';
+        END LOOP;
+    """ if partitioned else ""
+    return f"""
+    DO $convert$
+    DECLARE
+        tables regclass[] := ARRAY[to_regclass('"order"'), to_regclass('order_item')];
+        definitions text[];
+        definition text;
+        index_name name;
+        month date;
+        last_month date;
+    BEGIN
+        -- Secondary indexes and foreign keys (other than order_item -> "order") to recreate
+        definitions := ARRAY(
+            SELECT replace(pg_get_indexdef(indexrelid), ' ON ONLY ', ' ON ') FROM pg_index
+            WHERE indrelid = ANY (tables) AND NOT indisprimary
+            UNION ALL
+            SELECT format('ALTER TABLE %s ADD CONSTRAINT %I %s', conrelid::regclass, conname, pg_get_constraintdef(oid))
+            FROM pg_constraint
+            WHERE conrelid = ANY (tables) AND contype = 'f' AND confrelid <> tables[1] AND conparentid = 0
+        );
+        -- Index names are schema-wide: move the legacy ones out of the way
+        FOR index_name IN
+            SELECT c.relname FROM pg_index x JOIN pg_class c ON c.oid = x.indexrelid
+            WHERE x.indrelid = ANY (tables)
+        LOOP
+            EXECUTE format('ALTER INDEX %I RENAME TO %I', index_name, index_name || '_legacy');
+        END LOOP;
+        ALTER TABLE order_item RENAME TO order_item_legacy;
+        ALTER TABLE "order" RENAME TO order_legacy;
+
+        CREATE TABLE "order" (LIKE order_legacy INCLUDING DEFAULTS){order_partition_by};
+        ALTER TABLE "order" ADD CONSTRAINT order_pkey PRIMARY KEY ({order_key});
+        CREATE TABLE order_item (LIKE order_item_legacy INCLUDING DEFAULTS){item_partition_by};
+        ALTER TABLE order_item ADD CONSTRAINT order_item_pkey PRIMARY KEY ({item_key});
+        ALTER TABLE order_item ADD CONSTRAINT order_item_order_id_fkey
+            FOREIGN KEY {item_fk} ON DELETE CASCADE;
+        {partitions}
+        FOREACH definition IN ARRAY definitions LOOP
+            EXECUTE definition;
+        END LOOP;
+    END $convert$
+    """
+
+
+def copy_order_rows_sql(table: str) -> str:
+    """INSERT every row of the legacy table into the new one (add a WHERE for a batch)."""
+    return f'INSERT INTO "{table}" SELECT * FROM {table}_legacy'
+
+
+# Checks every row arrived, hands the id sequences to the new tables and drops the legacy ones
+FINISH_ORDER_TABLES_SQL = """
+    DO $convert$
+    BEGIN
+        IF (SELECT count(*) FROM order_legacy) <> (SELECT count(*) FROM "order")
+           OR (SELECT count(*) FROM order_item_legacy) <> (SELECT count(*) FROM order_item) THEN
+            RAISE EXCEPTION 'order tables conversion: row counts differ, legacy tables kept';
+        END IF;
+        EXECUTE format('ALTER SEQUENCE %s OWNED BY "order".id', pg_get_serial_sequence('order_legacy', 'id'));
+        EXECUTE format(
+            'ALTER SEQUENCE %s OWNED BY order_item.id', pg_get_serial_sequence('order_item_legacy', 'id')
+        );
+        DROP TABLE order_item_legacy;
+        DROP TABLE order_legacy;
+    END $convert$
+"""
+
+
+def convert_order_tables(conn: Connection, partitioned: bool, months_ahead: int | None = None) -> bool:
+    """Rebuild order/order_item as partitioned (or plain) tables; False if they already are.
+
+    Synchronous: the script calls it via AsyncConnection.run_sync (migration 015
+    keeps its own frozen copy of this conversion). conn must be in autocommit mode, since rows are
+    copied in committed batches. Re-runnable: the table swap is atomic and the
+    copy resumes after the highest id already copied, so a run that was
+    interrupted is finished by running it again. Stop the API first: orders
+    written to the legacy tables after their rows were copied would be missing
+    (the final row count check then refuses to drop the legacy tables).
+    """
+    if months_ahead is None:
+        months_ahead = settings.ORDER_PARTITION_MONTHS_AHEAD
+    conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _LOCK_KEY})
+    try:
+        swapped = conn.execute(text("SELECT to_regclass('order_legacy') IS NOT NULL")).scalar_one()
+        if not swapped:
+            if conn.execute(_IS_PARTITIONED).scalar_one() == partitioned:
+                return False
+            conn.execute(text(swap_order_tables_sql(partitioned, months_ahead)))
+        # Orders first: the new order_item foreign key checks each copied row
+        for table in _TABLES:
+            copy = text(f"{copy_order_rows_sql(table)} WHERE id > :start AND id <= :end")
+            done = conn.execute(text(f'SELECT coalesce(max(id), 0) FROM "{table}"')).scalar_one()
+            last = conn.execute(text(f"SELECT coalesce(max(id), 0) FROM {table}_legacy")).scalar_one()
+            for start in range(done, last, CONVERT_BATCH):
+                conn.execute(copy, {"start": start, "end": start + CONVERT_BATCH})
+        conn.execute(text(FINISH_ORDER_TABLES_SQL))
+        return True
+    finally:
+        conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
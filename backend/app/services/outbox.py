@@ -0,0 +1,110 @@
+"""
+Transactional outbox: side effects of a write, delivered after it commits.
+
+enqueue_event() adds an outbox_event row to the caller's session, so the event
+exists if and only if the business transaction (e.g. order placement) commits,
+and the request never waits on email, analytics or other downstream work.
+
+A worker (drain_outbox: in process via the lifespan, or scripts/outbox_worker.py)
+claims due events in batches with FOR UPDATE SKIP LOCKED, so any number of
+workers can run side by side, and passes each payload to the handlers registered
+for its topic (@outbox_handler, see services/outbox_handlers.py). A failing event
+is retried with exponential backoff and given up on after OUTBOX_MAX_ATTEMPTS.
+
+Delivery is at least once: a worker that dies mid-batch leaves its events to be
+claimed again, and all of an event's handlers rerun when one of them fails. Handlers
+must be idempotent.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.outbox_event import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Awaitable[None]]
+
+_handlers: dict[str, list[Handler]] = {}
+
+
+def outbox_handler(topic: str) -> Callable[[Handler], Handler]:
+    """Decorator: call the function with the payload of every `topic` event."""
+
+    def register(handler: Handler) -> Handler:
+        _handlers.setdefault(topic, []).append(handler)
+        return handler
+
+    return register
+
+
+def enqueue_event(db: AsyncSession, topic: str, payload: dict) -> OutboxEvent:
+    """Add an event to the caller's transaction; it is delivered only if that commits."""
+    event = OutboxEvent(topic=topic, payload=payload)
+    db.add(event)
+    return event
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff: base, 2×base, 4×base, ... capped at OUTBOX_RETRY_MAX_SECONDS."""
+    seconds = settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.OUTBOX_RETRY_MAX_SECONDS))
+
+
+async def process_outbox_batch(db: AsyncSession) -> int:
+    """Claim up to OUTBOX_BATCH_SIZE due events, run their handlers and commit; returns how many."""
+    result = await db.execute(
+        select(OutboxEvent)
+        .where(
+            OutboxEvent.processed_at.is_(None),
+            OutboxEvent.failed_at.is_(None),
+            OutboxEvent.available_at <= func.now(),
+        )
+        .order_by(OutboxEvent.available_at, OutboxEvent.id)
+        .limit(settings.OUTBOX_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    events = result.scalars().all()
+    for event in events:
+        try:
+            for handler in _handlers.get(event.topic, []):
+                await handler(event.payload)
+        except Exception as exc:
+            event.attempts += 1
+            event.last_error = f"{type(exc).__name__}: {exc}"
+            if event.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                event.failed_at = func.now()
+                logger.exception("Outbox event %s (%s) failed for good", event.id, event.topic)
+            else:
+                event.available_at = func.now() + _retry_delay(event.attempts)
+                logger.warning("Outbox event %s (%s) failed, will retry: %s", event.id, event.topic, exc)
+        else:
+            event.processed_at = func.now()
+    await db.commit()
+    return len(events)
+
+
+async def drain_outbox(db: AsyncSession) -> int:
+    """Process batches until no due event is left; returns events handled (or retried)."""
+    total = 0
+    while True:
+        handled = await process_outbox_batch(db)
+        total += handled
+        if handled < settings.OUTBOX_BATCH_SIZE:
+            return total
+
+
+async def purge_processed_events(db: AsyncSession) -> int:
+    """Delete events delivered more than OUTBOX_RETENTION_HOURS ago; returns how many."""
+    result = await db.execute(
+        delete(OutboxEvent).where(
+            OutboxEvent.processed_at < func.now() - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+        )
+    )
+    await db.commit()
+    return result.rowcount
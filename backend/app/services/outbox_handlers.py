@@ -0,0 +1,54 @@
+"""
+Built-in outbox handlers (services/outbox.py). Importing this module registers them.
+
+There is no mail or analytics provider configured yet, so order.placed is only
+logged; a provider integration registers its own @outbox_handler("order.placed")
+next to these. Low stock alerts are logged at WARNING for the ops log pipeline.
+"""
+
+import logging
+
+from sqlalchemy import Integer, any_, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.product import Product
+from app.services.outbox import outbox_handler
+
+logger = logging.getLogger(__name__)
+
+# Payload: OrderRead as JSON (api/v1/orders.py create_order)
+ORDER_PLACED = "order.placed"
+
+
+@outbox_handler(ORDER_PLACED)
+async def log_order_placed(order: dict) -> None:
+    """Confirmation/analytics hook: record the placed order."""
+    logger.info(
+        "Order %s placed by user %s: %s item(s), total %s",
+        order["id"],
+        order["user_id"],
+        len(order["items"]),
+        order["total_amount"],
+    )
+
+
+@outbox_handler(ORDER_PLACED)
+async def alert_low_stock(order: dict) -> None:
+    """Warn about ordered products whose stock is now at or below LOW_STOCK_ALERT_THRESHOLD."""
+    product_ids = sorted({item["product_id"] for item in order["items"]})
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(Product.id, Product.name, Product.stock).where(
+                Product.id == any_(literal(product_ids, ARRAY(Integer))),
+                Product.stock <= settings.LOW_STOCK_ALERT_THRESHOLD,
+            )
+        )
+        for product in result.all():
+            logger.warning(
+                "Low stock: product %s '%s' has %s unit(s) left",
+                product.id,
+                product.name,
+                product.stock,
+            )
@@ -0,0 +1,87 @@
+"""
+Keyset (cursor) pagination helpers.
+
+OFFSET pagination makes Postgres walk and discard every earlier row, so deep pages
+get linearly slower. A Keyset instead filters on the sort key of the last row seen
+(`(created_at, id) < (:c, :i)`), which an index on the same columns answers with a
+single range scan no matter how deep the client has paged.
+
+Cursors are opaque to clients: URL-safe base64 of the keyset name and the last
+row's key values.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import ColumnElement, Row, tuple_
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _decode_value(column: ColumnElement, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+class Keyset:
+    """Sort keys (all ascending or all descending) usable for cursor pagination.
+
+    The last key must be unique (normally the primary key) so the order is total.
+    """
+
+    def __init__(self, name: str, *columns: ColumnElement, descending: bool = True) -> None:
+        self.name = name
+        self.columns = columns
+        self.descending = descending
+
+    def order_by(self) -> list[ColumnElement]:
+        """ORDER BY clauses matching the keyset direction."""
+        return [c.desc() if self.descending else c.asc() for c in self.columns]
+
+    def key_columns(self) -> list[ColumnElement]:
+        """Labeled copies of the key columns; add these to the SELECT so rows carry their cursor."""
+        return [c.label(f"cursor_{i}") for i, c in enumerate(self.columns)]
+
+    def after(self, cursor: str) -> ColumnElement[bool]:
+        """WHERE clause selecting rows strictly after the decoded cursor."""
+        values = self.decode(cursor)
+        key = tuple_(*self.columns)
+        return key < tuple_(*values) if self.descending else key > tuple_(*values)
+
+    def encode(self, values: Sequence[Any]) -> str:
+        payload = json.dumps({"k": self.name, "v": [_encode_value(v) for v in values]})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> tuple:
+        """Decode a cursor produced by encode(); 400 if malformed or from another keyset."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if payload["k"] != self.name or len(payload["v"]) != len(self.columns):
+                raise ValueError("cursor does not match this listing")
+            return tuple(_decode_value(c, v) for c, v in zip(self.columns, payload["v"]))
+        except (binascii.Error, ValueError, KeyError, TypeError, InvalidOperation) as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+    def page(self, rows: Sequence[Row], size: int) -> tuple[list[Row], str | None]:
+        """Trim rows fetched with LIMIT size + 1 and build next_cursor from the last kept row."""
+        rows = list(rows)
+        if len(rows) <= size:
+            return rows, None
+        rows = rows[:size]
+        last = rows[-1]._mapping
+        return rows, self.encode([last[f"cursor_{i}"] for i in range(len(self.columns))])
@@ -0,0 +1,122 @@
+"""
+Time-limited stock reservations (cart holds).
+
+A hold keeps quantity units of a product for one user until expires_at; expired
+holds are simply ignored by every read, and a background sweeper deletes them in
+batches. Units available to a shopper are stock minus other users' active holds,
+summed from ix_stock_reservation_product_expires without touching the table.
+
+Placing or changing a hold locks the product row (FOR UPDATE), the same lock
+checkout takes, so a hold can never promise stock a concurrent checkout is
+taking. Checkout converts the buyer's holds into the stock decrement and deletes
+them (services/checkout.py).
+"""
+
+from collections.abc import Sequence
+from datetime import timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import ColumnElement, Integer, any_, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.product import Product
+from app.models.stock_reservation import StockReservation
+
+
+def active_holds(product_id: ColumnElement[int] | int) -> ColumnElement[int]:
+    """Scalar subquery: units of product_id held by unexpired reservations."""
+    return (
+        select(func.coalesce(func.sum(StockReservation.quantity), 0))
+        .where(
+            StockReservation.product_id == product_id,
+            StockReservation.expires_at > func.now(),
+        )
+        .scalar_subquery()
+    )
+
+
+async def holds_by_product(
+    db: AsyncSession,
+    user_id: int,
+    product_ids: Sequence[int],
+) -> dict[int, tuple[int, int]]:
+    """product_id -> (units held by user_id, units held by everyone else), active holds only."""
+    mine = func.coalesce(func.sum(StockReservation.quantity).filter(StockReservation.user_id == user_id), 0)
+    others = func.coalesce(func.sum(StockReservation.quantity).filter(StockReservation.user_id != user_id), 0)
+    result = await db.execute(
+        select(StockReservation.product_id, mine, others)
+        .where(
+            StockReservation.product_id == any_(literal(list(product_ids), ARRAY(Integer))),
+            StockReservation.expires_at > func.now(),
+        )
+        .group_by(StockReservation.product_id)
+    )
+    return {product_id: (m, o) for product_id, m, o in result.all()}
+
+
+async def reserve(db: AsyncSession, user_id: int, product_id: int, quantity: int) -> StockReservation:
+    """Create or replace the user's hold on a product (TTL restarts); caller commits.
+
+    404 if the product is missing or inactive, 409 if not enough units are free.
+    """
+    product = (
+        await db.execute(
+            select(Product.stock, Product.is_active).where(Product.id == product_id).with_for_update()
+        )
+    ).one_or_none()
+    if not product or not product.is_active:
+        raise HTTPException(status_code=404, detail="Product not found")
+    _, held_by_others = (await holds_by_product(db, user_id, [product_id])).get(product_id, (0, 0))
+    available = product.stock - held_by_others
+    if available < quantity:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Only {max(available, 0)} unit(s) available to reserve",
+        )
+    stmt = insert(StockReservation).values(
+        user_id=user_id,
+        product_id=product_id,
+        quantity=quantity,
+        expires_at=func.now() + timedelta(seconds=settings.RESERVATION_TTL_SECONDS),
+    )
+    result = await db.execute(
+        stmt.on_conflict_do_update(
+            constraint="uq_stock_reservation_user_product",
+            set_={"quantity": stmt.excluded.quantity, "expires_at": stmt.excluded.expires_at},
+        ).returning(StockReservation)
+    )
+    return result.scalar_one()
+
+
+async def release(db: AsyncSession, user_id: int, product_ids: Sequence[int]) -> int:
+    """Delete the user's holds on these products; returns how many were removed."""
+    result = await db.execute(
+        delete(StockReservation).where(
+            StockReservation.user_id == user_id,
+            StockReservation.product_id == any_(literal(list(product_ids), ARRAY(Integer))),
+        )
+    )
+    return result.rowcount
+
+
+async def sweep_expired_reservations(db: AsyncSession) -> int:
+    """Delete expired holds in batches of RESERVATION_SWEEP_BATCH, one commit per batch.
+
+    SKIP LOCKED lets several workers sweep at once without waiting on each other.
+    """
+    removed = 0
+    while True:
+        batch = (
+            select(StockReservation.id)
+            .where(StockReservation.expires_at <= func.now())
+            .order_by(StockReservation.expires_at)
+            .limit(settings.RESERVATION_SWEEP_BATCH)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(delete(StockReservation).where(StockReservation.id.in_(batch)))
+        await db.commit()
+        removed += result.rowcount
+        if result.rowcount < settings.RESERVATION_SWEEP_BATCH:
+            return removed
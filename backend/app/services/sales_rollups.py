@@ -0,0 +1,115 @@
+"""
+Daily sales rollups behind the admin reports (api/v1/admin/reports.py).
+
+sales_daily, sales_daily_category and sales_daily_product hold revenue, units
+and order counts per UTC day, so a report reads one row per day (or per day and
+category/product) instead of aggregating order_item. Checkout does not touch
+them: refresh_sales_rollups() runs every SALES_ROLLUP_REFRESH_SECONDS and folds
+in committed orders whose rolled_up flag is still false, in batches, adding to
+the existing rows and setting the flag in the same statement.
+
+Progress is tracked per order rather than by created_at, so an order whose
+checkout transaction committed long after it started (created_at is the start
+of that transaction) is still counted exactly once. Orders are counted as
+placed (later status changes and deletions are not reflected);
+rebuild_sales_rollups() recomputes everything from scratch.
+"""
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order import Order
+from app.models.sales_rollup import (
+    SalesDaily,
+    SalesDailyCategory,
+    SalesDailyProduct,
+    SalesRollupState,
+)
+
+# Orders folded in per transaction
+FOLD_BATCH = 5000
+
+_TOTALS = "sum(amount), sum(quantity), count(DISTINCT order_id)"
+
+_ADD = """
+    ON CONFLICT ({key}) DO UPDATE SET
+        revenue = {table}.revenue + excluded.revenue,
+        units = {table}.units + excluded.units,
+        orders = {table}.orders + excluded.orders
+"""
+
+_ROLLUPS = (
+    ("sales_daily", "day"),
+    ("sales_daily_category", "day, category_id"),
+    ("sales_daily_product", "day, product_id"),
+)
+
+_FOLDS = ",".join(
+    f"""
+    fold_{table} AS (
+        INSERT INTO {table} ({key}, revenue, units, orders)
+        SELECT {key}, {_TOTALS} FROM lines GROUP BY {key}
+        {_ADD.format(key=key, table=table)}
+    )"""
+    for table, key in _ROLLUPS
+)
+
+# One statement: flag a batch of pending orders (ix_order_pending_rollup) and add their
+# lines to all three rollups, so an order is counted if and only if its flag is set.
+# Joining items on order_created_at lets partitioned order_item prune.
+_FOLD_SQL = text(
+    f"""
+    WITH batch AS (
+        UPDATE "order" SET rolled_up = true
+        WHERE (id, created_at) IN (
+            SELECT id, created_at FROM "order" WHERE NOT rolled_up
+            ORDER BY id LIMIT :limit FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, created_at
+    ),
+    lines AS (
+        SELECT (o.created_at AT TIME ZONE 'UTC')::date AS day,
+               o.id AS order_id,
+               oi.product_id,
+               p.category_id,
+               oi.quantity,
+               oi.price_at_purchase * oi.quantity AS amount
+        FROM batch o
+        JOIN order_item oi ON oi.order_id = o.id AND oi.order_created_at = o.created_at
+        JOIN product p ON p.id = oi.product_id
+    ),{_FOLDS}
+    SELECT count(*) FROM batch
+    """
+)
+
+async def refresh_sales_rollups(db: AsyncSession) -> int:
+    """Fold committed orders not yet rolled up into the rollups; returns how many.
+
+    Returns 0 without waiting if another worker is already refreshing.
+    """
+    folded = 0
+    while True:
+        locked = (
+            await db.execute(
+                select(SalesRollupState.id)
+                .where(SalesRollupState.id == 1)
+                .with_for_update(skip_locked=True)
+            )
+        ).scalar_one_or_none()
+        if locked is None:
+            return folded
+        batch = (await db.execute(_FOLD_SQL, {"limit": FOLD_BATCH})).scalar_one()
+        await db.commit()
+        folded += batch
+        if batch < FOLD_BATCH:
+            return folded
+
+
+async def rebuild_sales_rollups(db: AsyncSession) -> int:
+    """Empty the rollups and refold every order; returns orders folded in."""
+    await db.execute(select(SalesRollupState).where(SalesRollupState.id == 1).with_for_update())
+    for model in (SalesDaily, SalesDailyCategory, SalesDailyProduct):
+        await db.execute(delete(model))
+    await db.execute(update(Order).where(Order.rolled_up.is_(True)).values(rolled_up=False))
+    await db.commit()
+    return await refresh_sales_rollups(db)
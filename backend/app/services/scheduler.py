@@ -0,0 +1,33 @@
+"""
+In-process periodic jobs, started from the application lifespan (app.main).
+
+Each job runs on its own asyncio task in every API worker; a failing run is
+logged and retried at the next interval instead of killing the loop.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from app.database import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+
+async def run_every(
+    seconds: float,
+    job: Callable[..., Awaitable[object]],
+    *,
+    with_session: bool = True,
+) -> None:
+    """Call job (with a fresh DB session unless with_session=False) every `seconds`, forever."""
+    while True:
+        await asyncio.sleep(seconds)
+        try:
+            if with_session:
+                async with async_session_maker() as db:
+                    await job(db)
+            else:
+                await job()
+        except Exception:
+            logger.exception("Periodic job %s failed", getattr(job, "__name__", job))
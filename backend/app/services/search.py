@@ -0,0 +1,58 @@
+"""
+Product search – full-text matching and relevance ranking.
+
+Product.search_vector is a generated tsvector (name weighted above description)
+backed by a GIN index, and Product.name has a trigram GIN index (pg_trgm) so
+misspelled queries still find close names. Both predicates are index-assisted,
+so search cost tracks the number of matches rather than the size of the catalog.
+"""
+
+import re
+
+from sqlalchemy import ColumnElement, false, func, literal_column, or_
+
+from app.models.product import Product
+
+# Text search configuration; must match the one used by Product.search_vector.
+SEARCH_CONFIG = "english"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _prefix_tsquery(term: str) -> ColumnElement | None:
+    """tsquery that AND-s every word of term as a prefix ("kurt" -> "kurt:*").
+
+    Words are extracted with a regex so tsquery operators typed by users can never
+    produce a syntax error. Returns None if term has no searchable words.
+    """
+    words = _WORD_RE.findall(term.lower())
+    if not words:
+        return None
+    return func.to_tsquery(
+        literal_column(f"'{SEARCH_CONFIG}'::regconfig"),
+        " & ".join(f"{w}:*" for w in words),
+    )
+
+
+def search_filter(term: str, fuzzy: bool = True) -> ColumnElement[bool]:
+    """WHERE clause for a user search term.
+
+    Matches the full-text vector (GIN) and, when fuzzy, names that are
+    trigram-similar to the term (pg_trgm GIN) so typos like "kurtta" still hit.
+    """
+    conditions = []
+    tsquery = _prefix_tsquery(term)
+    if tsquery is not None:
+        conditions.append(Product.search_vector.op("@@")(tsquery))
+    if fuzzy:
+        conditions.append(Product.name.op("%")(term))
+    return or_(*conditions) if conditions else false()
+
+
+def search_rank(term: str) -> ColumnElement[float]:
+    """Relevance score for ORDER BY: full-text rank plus name similarity."""
+    similarity = func.similarity(Product.name, term)
+    tsquery = _prefix_tsquery(term)
+    if tsquery is None:
+        return similarity
+    return func.ts_rank_cd(Product.search_vector, tsquery) + similarity
@@ -0,0 +1,184 @@
+"""
+Sharded stock counters for hot products.
+
+Normally every checkout of a product updates (and first locks) its product row,
+so a flash sale on one item serializes all of its checkouts. A product with
+stock_sharded set instead keeps its stock in N product_stock_shard rows: a
+checkout decrements one random shard that has capacity, skipping shards other
+checkouts hold locked, and never touches the product row.
+
+product.stock of a sharded product is the sum of its shards, refreshed every
+STOCK_SHARD_SYNC_SECONDS by sync_sharded_stock() (and after admin changes), so
+catalog reads keep reading one column. Only one worker syncs per interval, and
+only products whose total changed are written. Oversell is still impossible: a shard
+cannot go below zero (CHECK constraint and guarded UPDATE).
+"""
+
+import random
+
+from fastapi import HTTPException
+from sqlalchemy import Integer, column, delete, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+from app.models.product_stock_shard import ProductStockShard
+from app.services.http_cache import bump_stock_version
+
+# pg_try_advisory_xact_lock key: one worker runs each sync, the others skip it
+_SYNC_LOCK_KEY = 0x7368617264
+
+
+def _split(total: int, shards: int) -> list[int]:
+    """Spread total over shards as evenly as possible."""
+    base, extra = divmod(total, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+async def _write_shards(db: AsyncSession, product_id: int, total: int, shards: int) -> None:
+    await db.execute(delete(ProductStockShard).where(ProductStockShard.product_id == product_id))
+    await db.execute(
+        insert(ProductStockShard),
+        [
+            {"product_id": product_id, "shard": i, "stock": stock}
+            for i, stock in enumerate(_split(total, shards))
+        ],
+    )
+
+
+async def enable_sharding(db: AsyncSession, product: Product, shards: int) -> None:
+    """Split product.stock across `shards` rows (or re-split an already sharded product)."""
+    if product.stock_sharded:
+        product.stock = await shard_total(db, product.id, lock=True)
+    await _write_shards(db, product.id, product.stock, shards)
+    product.stock_sharded = True
+
+
+async def disable_sharding(db: AsyncSession, product: Product) -> None:
+    """Fold the shards back into product.stock."""
+    if not product.stock_sharded:
+        return
+    product.stock = await shard_total(db, product.id, lock=True)
+    await db.execute(delete(ProductStockShard).where(ProductStockShard.product_id == product.id))
+    product.stock_sharded = False
+
+
+async def set_sharded_stock(db: AsyncSession, product: Product, total: int) -> None:
+    """Admin stock change on a sharded product: re-spread the new total over its shards."""
+    shards = len(
+        (
+            await db.execute(
+                select(ProductStockShard.shard)
+                .where(ProductStockShard.product_id == product.id)
+                .with_for_update()
+            )
+        ).all()
+    )
+    await _write_shards(db, product.id, total, shards or 1)
+    product.stock = total
+
+
+async def shard_total(db: AsyncSession, product_id: int, lock: bool = False) -> int:
+    """Exact sum of a product's shards (lock=True holds them until commit)."""
+    if lock:
+        rows = await db.execute(
+            select(ProductStockShard.stock)
+            .where(ProductStockShard.product_id == product_id)
+            .with_for_update()
+        )
+        return sum(rows.scalars().all())
+    result = await db.execute(
+        select(func.coalesce(func.sum(ProductStockShard.stock), 0)).where(
+            ProductStockShard.product_id == product_id
+        )
+    )
+    return result.scalar_one()
+
+
+async def take_sharded_stock(db: AsyncSession, product_id: int, quantity: int, name: str) -> None:
+    """Decrement quantity units from a sharded product; 400 if its shards can't cover it.
+
+    Fast path: one random unlocked shard with enough stock. If every such shard
+    is locked by other checkouts or none holds enough alone, all shards are locked
+    in shard order and the quantity is taken greedily across them.
+    """
+    candidate = (
+        select(ProductStockShard.shard)
+        .where(ProductStockShard.product_id == product_id, ProductStockShard.stock >= quantity)
+        # random() per row is fine for a handful of shards
+        .order_by(func.random())
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    taken = await db.execute(
+        update(ProductStockShard)
+        .where(ProductStockShard.product_id == product_id, ProductStockShard.shard == candidate)
+        .values(stock=ProductStockShard.stock - quantity)
+        .returning(ProductStockShard.shard)
+        .execution_options(synchronize_session=False)
+    )
+    if taken.first() is not None:
+        return
+
+    rows = (
+        await db.execute(
+            select(ProductStockShard.shard, ProductStockShard.stock)
+            .where(ProductStockShard.product_id == product_id)
+            .order_by(ProductStockShard.shard)
+            .with_for_update()
+        )
+    ).all()
+    available = sum(stock for _, stock in rows)
+    if available < quantity:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient stock for '{name}' (available: {available}, requested: {quantity})",
+        )
+    # Start at a random shard so concurrent fallbacks drain shards evenly
+    start = random.randrange(len(rows))
+    remaining = quantity
+    takes: list[tuple[int, int]] = []
+    for shard, stock in rows[start:] + rows[:start]:
+        take = min(stock, remaining)
+        if take:
+            takes.append((shard, take))
+            remaining -= take
+        if not remaining:
+            break
+    amounts = values(column("shard", Integer), column("qty", Integer), name="takes").data(takes)
+    await db.execute(
+        update(ProductStockShard)
+        .where(ProductStockShard.product_id == product_id, ProductStockShard.shard == amounts.c.shard)
+        .values(stock=ProductStockShard.stock - amounts.c.qty)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def sync_sharded_stock(db: AsyncSession) -> int:
+    """Copy each sharded product's shard sum into product.stock; returns rows changed.
+
+    Returns 0 without doing anything while another worker's sync holds the lock.
+    """
+    if not (await db.execute(select(func.pg_try_advisory_xact_lock(_SYNC_LOCK_KEY)))).scalar_one():
+        await db.rollback()
+        return 0
+    totals = (
+        select(ProductStockShard.product_id, func.sum(ProductStockShard.stock).label("total"))
+        .group_by(ProductStockShard.product_id)
+        .subquery()
+    )
+    result = await db.execute(
+        update(Product)
+        .where(
+            Product.id == totals.c.product_id,
+            Product.stock_sharded.is_(True),
+            Product.stock != totals.c.total,
+        )
+        .values(stock=totals.c.total)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount:
+        await bump_stock_version(db)
+    return result.rowcount
@@ -0,0 +1,195 @@
+"""
+Typeahead suggestions from an in-process prefix index.
+
+Every word position of each active product name and category name becomes a
+key ("Polo Shirt" -> "polo shirt", "shirt"), kept in sorted lists so a prefix
+lookup is a bisect plus a short forward scan – no database round-trip per keystroke.
+Keys are split into one list per ranking tier (categories before products, whole
+names before later words), so a popular prefix in a lower tier cannot push a
+better match past the scan limit.
+
+The index is built at startup, patched by the admin endpoints after each write
+(upsert/remove), and rebuilt every SUGGEST_REBUILD_SECONDS so workers that did
+not serve a write converge. Patches made while a rebuild is loading are
+journaled and re-applied after the swap, since the loaded snapshot may predate
+them.
+"""
+
+import re
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Literal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.models.product import Product
+
+SuggestionKind = Literal["category", "product"]
+
+# (kind, key starts the name) in ranking order; each tier has its own sorted key list
+_TIERS: tuple[tuple[SuggestionKind, bool], ...] = (
+    ("category", True),
+    ("category", False),
+    ("product", True),
+    ("product", False),
+)
+
+# Keys scanned per tier and lookup before ranking; bounds the cost of one-letter prefixes
+_SCAN_LIMIT = 200
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+    """Lowercase words joined by single spaces (punctuation dropped)."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+@dataclass(frozen=True, slots=True)
+class Suggestion:
+    kind: SuggestionKind
+    id: int
+    name: str
+    slug: str
+
+
+class SuggestIndex:
+    """Sorted (key, id) entries per tier over product and category names."""
+
+    def __init__(self) -> None:
+        self._keys: dict[tuple[SuggestionKind, bool], list[tuple[str, int]]] = {
+            tier: [] for tier in _TIERS
+        }
+        self._items: dict[tuple[SuggestionKind, int], Suggestion] = {}
+        self.built = False
+        # Patches since the oldest in-flight rebuild began, replayed on every swap
+        self._rebuilds = 0
+        self._journal: list[tuple[SuggestionKind, int, Suggestion | None]] = []
+
+    @staticmethod
+    def _keys_for(item: Suggestion) -> list[tuple[tuple[SuggestionKind, bool], tuple[str, int]]]:
+        words = normalize(item.name).split(" ")
+        return [
+            ((item.kind, i == 0), (" ".join(words[i:]), item.id))
+            for i in range(len(words))
+            if words[i]
+        ]
+
+    def begin_rebuild(self) -> None:
+        """Start journaling patches; call before loading a snapshot for replace_all."""
+        self._rebuilds += 1
+
+    def end_rebuild(self) -> None:
+        """Pair of begin_rebuild (also when the load failed)."""
+        self._rebuilds -= 1
+        if not self._rebuilds:
+            self._journal.clear()
+
+    def replace_all(self, items: list[Suggestion]) -> None:
+        """Swap in a freshly built index, then re-apply patches made while it loaded."""
+        self._items = {(item.kind, item.id): item for item in items}
+        keys: dict[tuple[SuggestionKind, bool], list[tuple[str, int]]] = {tier: [] for tier in _TIERS}
+        for item in items:
+            for tier, key in self._keys_for(item):
+                keys[tier].append(key)
+        for tier_keys in keys.values():
+            tier_keys.sort()
+        self._keys = keys
+        self.built = True
+        for kind, id, item in self._journal:
+            if item is None:
+                self._remove(kind, id)
+            else:
+                self._upsert(item)
+
+    def upsert(self, item: Suggestion) -> None:
+        """Add an entry or replace it after a rename."""
+        if self._rebuilds:
+            self._journal.append((item.kind, item.id, item))
+        self._upsert(item)
+
+    def remove(self, kind: SuggestionKind, id: int) -> None:
+        if self._rebuilds:
+            self._journal.append((kind, id, None))
+        self._remove(kind, id)
+
+    def _upsert(self, item: Suggestion) -> None:
+        self._remove(item.kind, item.id)
+        self._items[(item.kind, item.id)] = item
+        for tier, key in self._keys_for(item):
+            insort(self._keys[tier], key)
+
+    def _remove(self, kind: SuggestionKind, id: int) -> None:
+        old = self._items.pop((kind, id), None)
+        if old is None:
+            return
+        for tier, key in self._keys_for(old):
+            tier_keys = self._keys[tier]
+            i = bisect_left(tier_keys, key)
+            if i < len(tier_keys) and tier_keys[i] == key:
+                del tier_keys[i]
+
+    def search(self, prefix: str, limit: int = 10) -> list[Suggestion]:
+        """Up to limit entries with a word starting with prefix.
+
+        Categories first, then names that start with the prefix, then shorter names.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        best: dict[tuple[SuggestionKind, int], tuple] = {}
+        for position, (kind, leading) in enumerate(_TIERS):
+            # Every entry of an earlier tier outranks this one, so stop once limit is met
+            if len(best) >= limit:
+                break
+            tier_keys = self._keys[(kind, leading)]
+            start = bisect_left(tier_keys, (prefix,))
+            for key, id in tier_keys[start:start + _SCAN_LIMIT]:
+                if not key.startswith(prefix):
+                    break
+                if (kind, id) in best:
+                    continue
+                item = self._items[(kind, id)]
+                best[(kind, id)] = (position, len(item.name), item.name)
+        ranked = sorted(best, key=best.__getitem__)
+        return [self._items[k] for k in ranked[:limit]]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+suggest_index = SuggestIndex()
+
+
+def product_suggestion(product: Product) -> Suggestion:
+    return Suggestion("product", product.id, product.name, product.slug)
+
+
+def category_suggestion(category: Category) -> Suggestion:
+    return Suggestion("category", category.id, category.name, category.slug)
+
+
+async def rebuild_suggest_index(db: AsyncSession) -> None:
+    """Reload every active product name and category name from the database."""
+    suggest_index.begin_rebuild()
+    try:
+        products = await db.execute(
+            select(Product.id, Product.name, Product.slug).where(Product.is_active.is_(True))
+        )
+        categories = await db.execute(select(Category.id, Category.name, Category.slug))
+        suggest_index.replace_all(
+            [Suggestion("product", *row) for row in products.all()]
+            + [Suggestion("category", *row) for row in categories.all()]
+        )
+    finally:
+        suggest_index.end_rebuild()
+
+
+def index_product(product: Product) -> None:
+    """Reflect an admin product write: active products are indexed, others removed."""
+    if product.is_active:
+        suggest_index.upsert(product_suggestion(product))
+    else:
+        suggest_index.remove("product", product.id)
@@ -0,0 +1,36 @@
+"""
+Per-user cache of wishlisted product ids (GET /wishlist/ids, /wishlist/contains).
+
+Product grids mark every card from this set, so it is cached in process under
+("ids", user_id) and dropped by add_to_wishlist / remove_from_wishlist in the
+same worker; other workers converge within WISHLIST_CACHE_TTL_SECONDS.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.wishlist import Wishlist
+from app.services.cache import TTLCache
+
+wishlist_cache = TTLCache(
+    "wishlist",
+    ttl=settings.WISHLIST_CACHE_TTL_SECONDS,
+    max_entries=settings.WISHLIST_CACHE_MAX_ENTRIES,
+)
+
+
+async def wishlisted_ids(db: AsyncSession, user_id: int) -> frozenset[int]:
+    """Product ids in the user's wishlist (cached)."""
+
+    async def load() -> frozenset[int]:
+        # Index-only scan of the (user_id, product_id) primary key
+        result = await db.execute(select(Wishlist.product_id).where(Wishlist.user_id == user_id))
+        return frozenset(result.scalars().all())
+
+    return await wishlist_cache.get_or_load(("ids", user_id), load)
+
+
+def invalidate_wishlist(user_id: int) -> None:
+    """Drop the user's cached ids after a wishlist write (this worker only)."""
+    wishlist_cache.discard(("ids", user_id))
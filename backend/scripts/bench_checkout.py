@@ -0,0 +1,166 @@
+"""
+Checkout concurrency benchmark: many parallel orders for one hot product.
+
+Creates a throwaway user, address, category and product with --stock units, fires
+--orders checkouts (each buying --quantity units) with up to --concurrency running
+at once, then checks that stock never went negative and that every unit sold
+belongs to exactly one order. Everything it created is deleted afterwards.
+
+With --shards N the run is repeated with the product's stock split across N
+shard rows (services/stock_shards.py) and the two throughputs are compared.
+
+Runs services.checkout.place_order directly (no HTTP/auth), one session per order.
+Point DATABASE_URL at a development database, never production.
+
+Run from backend/:
+  python scripts/bench_checkout.py --orders 500 --concurrency 100 --stock 300
+  python scripts/bench_checkout.py --orders 2000 --concurrency 200 --stock 5000 --shards 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add backend root to path so "app" is found when running: python scripts/bench_checkout.py
+_backend_root = Path(__file__).resolve().parent.parent
+if str(_backend_root) not in sys.path:
+    sys.path.insert(0, str(_backend_root))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--orders", type=int, default=500, help="checkouts to attempt")
+    parser.add_argument("--concurrency", type=int, default=100, help="checkouts in flight at once")
+    parser.add_argument("--stock", type=int, default=300, help="initial stock of the hot product")
+    parser.add_argument("--quantity", type=int, default=1, help="units per order")
+    parser.add_argument(
+        "--shards", type=int, default=0, help="also run with stock split across this many shards"
+    )
+    return parser.parse_args()
+
+
+async def run_once(args: argparse.Namespace, shards: int) -> float:
+    """One benchmark round; prints its report and returns checkouts/s."""
+    from fastapi import HTTPException
+    from sqlalchemy import delete, func, select
+
+    from app.database import async_session_maker
+    from app.models.address import Address
+    from app.models.category import Category
+    from app.models.order import Order
+    from app.models.product import Product
+    from app.models.user import User
+    from app.schemas.order import OrderCreate, OrderItemCreate
+    from app.services.category_paths import assign_path
+    from app.services.checkout import place_order
+    from app.services.stock_shards import enable_sharding, shard_total
+
+    tag = uuid.uuid4().hex[:8]
+    async with async_session_maker() as db:
+        user = User(email=f"bench-{tag}@example.com", hashed_password="!", is_active=True)
+        category = Category(name=f"Bench {tag}", slug=f"bench-{tag}")
+        await assign_path(db, category)
+        db.add_all([user, category])
+        await db.flush()
+        address = Address(
+            user_id=user.id, label="Bench", street="-", city="-",
+            province="-", postal_code="-", phone="-",
+        )
+        product = Product(
+            name=f"Bench product {tag}", slug=f"bench-product-{tag}", description="-",
+            price=100, stock=args.stock, category_id=category.id, is_active=True,
+        )
+        db.add_all([address, product])
+        await db.flush()
+        if shards:
+            await enable_sharding(db, product, shards)
+        await db.commit()
+    body = OrderCreate(
+        shipping_address_id=address.id,
+        payment_method="cod",
+        items=[OrderItemCreate(product_id=product.id, quantity=args.quantity)],
+    )
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    outcomes: dict[str, int] = {}
+
+    async def checkout() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            async with async_session_maker() as db:
+                try:
+                    await place_order(db, user.id, body)
+                    await db.commit()
+                    outcome = "placed"
+                except HTTPException as exc:
+                    await db.rollback()
+                    outcome = f"rejected {exc.status_code}"
+            latencies.append(time.perf_counter() - started)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(checkout() for _ in range(args.orders)))
+    elapsed = time.perf_counter() - started
+
+    try:
+        async with async_session_maker() as db:
+            if shards:
+                stock = await shard_total(db, product.id)
+            else:
+                stock = (await db.execute(select(Product.stock).where(Product.id == product.id))).scalar_one()
+            orders = (
+                await db.execute(select(func.count()).select_from(Order).where(Order.user_id == user.id))
+            ).scalar_one()
+    finally:
+        async with async_session_maker() as db:
+            await db.execute(delete(Order).where(Order.user_id == user.id))
+            await db.execute(delete(Address).where(Address.id == address.id))
+            await db.execute(delete(Product).where(Product.id == product.id))
+            await db.execute(delete(Category).where(Category.id == category.id))
+            await db.execute(delete(User).where(User.id == user.id))
+            await db.commit()
+
+    sold = args.stock - stock
+    expected = min(args.orders, args.stock // args.quantity)
+    ms = sorted(x * 1000 for x in latencies)
+    throughput = args.orders / elapsed
+    print(f"== {f'{shards} shards' if shards else 'unsharded'} ==")
+    print(f"orders attempted: {args.orders}, concurrency: {args.concurrency}, wall time: {elapsed:.2f}s")
+    print(f"throughput: {throughput:.1f} checkouts/s")
+    print(
+        f"latency ms: p50 {statistics.median(ms):.1f}, "
+        f"p95 {ms[int(len(ms) * 0.95) - 1]:.1f}, max {ms[-1]:.1f}"
+    )
+    print("outcomes:", ", ".join(f"{k}: {v}" for k, v in sorted(outcomes.items())))
+    print(f"units sold: {sold}, final stock: {stock}, orders stored: {orders}")
+    consistent = stock >= 0 and sold == orders * args.quantity and orders == expected
+    print("consistency:", "OK" if consistent else "FAILED (oversold or lost orders)")
+    if not consistent:
+        sys.exit(1)
+    return throughput
+
+
+def main() -> None:
+    args = parse_args()
+
+    async def run() -> None:
+        from app.database import engine
+
+        try:
+            baseline = await run_once(args, 0)
+            if args.shards:
+                sharded = await run_once(args, args.shards)
+                print(f"\nsharded / unsharded throughput: {sharded / baseline:.2f}x")
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Maintain the monthly order/order_item partitions (see services/order_partitions.py).
+
+  partition    convert existing plain order tables to monthly partitions (stop the
+               API first; set ORDER_PARTITIONING so it keeps partitions ahead)
+  unpartition  convert them back to plain tables
+  ensure       create partitions from this month to --months-ahead months ahead
+               (the API also does this daily when ORDER_PARTITIONING is set)
+  detach       detach partitions for months before --before YYYY-MM; with --archive
+               the detached tables are moved to the "archive" schema
+  list         print the months that have partitions
+
+partition and unpartition copy rows in committed batches and can be re-run to
+finish an interrupted conversion. The other commands do nothing (and say so)
+when the order tables are not partitioned.
+
+Run from backend/:
+  python scripts/order_partitions.py partition
+  python scripts/order_partitions.py ensure --months-ahead 6
+  python scripts/order_partitions.py detach --before 2025-01 --archive
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add backend root to path so "app" is found when running: python scripts/order_partitions.py
+_backend_root = Path(__file__).resolve().parent.parent
+if str(_backend_root) not in sys.path:
+    sys.path.insert(0, str(_backend_root))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    partition = commands.add_parser("partition", help="convert the order tables to monthly partitions")
+    partition.add_argument("--months-ahead", type=int, default=None, help="default: ORDER_PARTITION_MONTHS_AHEAD")
+    commands.add_parser("unpartition", help="convert the order tables back to plain tables")
+    ensure = commands.add_parser("ensure", help="create upcoming partitions")
+    ensure.add_argument("--months-ahead", type=int, default=None, help="default: ORDER_PARTITION_MONTHS_AHEAD")
+    detach = commands.add_parser("detach", help="detach (and optionally archive) old partitions")
+    detach.add_argument(
+        "--before",
+        type=lambda value: datetime.strptime(value, "%Y-%m").date(),
+        required=True,
+        help="first month to keep, YYYY-MM",
+    )
+    detach.add_argument("--archive", action="store_true", help="move detached tables to the archive schema")
+    commands.add_parser("list", help="list partition months")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    async def run() -> None:
+        from app.database import async_session_maker, engine
+        from app.services.order_partitions import (
+            convert_order_tables,
+            detach_order_partitions,
+            ensure_order_partitions,
+            is_partitioned,
+            list_partition_months,
+        )
+
+        if args.command in ("partition", "unpartition"):
+            partitioned = args.command == "partition"
+            months_ahead = args.months_ahead if partitioned else None
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                converted = await conn.run_sync(convert_order_tables, partitioned, months_ahead)
+            layout = "monthly partitions" if partitioned else "plain tables"
+            print(f"Order tables converted to {layout}." if converted else f"Order tables are already {layout}.")
+            return
+
+        async with async_session_maker() as db:
+            if not await is_partitioned(db):
+                print("Order tables are not partitioned (see ORDER_PARTITIONING); nothing to do.")
+                return
+            if args.command == "ensure":
+                created = await ensure_order_partitions(db, args.months_ahead)
+                print(f"Order partitions ensured: {created} table(s) created.")
+            elif args.command == "detach":
+                try:
+                    detached = await detach_order_partitions(db, args.before, archive=args.archive)
+                except ValueError as exc:
+                    sys.exit(str(exc))
+                print(f"Detached {len(detached)} table(s): {', '.join(detached) or '-'}")
+            else:
+                for month in await list_partition_months(db):
+                    print(f"{month:%Y-%m}")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Standalone outbox worker: deliver outbox events (services/outbox.py) outside the API.
+
+Use it with OUTBOX_WORKER_IN_PROCESS=false to keep side effects off the API
+processes, or next to them to add capacity (workers never claim the same event).
+Polls every OUTBOX_POLL_SECONDS until interrupted; --once drains due events and exits.
+
+Run from backend/:
+  python scripts/outbox_worker.py
+  python scripts/outbox_worker.py --once
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add backend root to path so "app" is found when running: python scripts/outbox_worker.py
+_backend_root = Path(__file__).resolve().parent.parent
+if str(_backend_root) not in sys.path:
+    sys.path.insert(0, str(_backend_root))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--once", action="store_true", help="drain due events once and exit")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    async def run() -> None:
+        import app.services.outbox_handlers  # noqa: F401 – registers the handlers
+        from app.config import settings
+        from app.database import async_session_maker, engine
+        from app.services.outbox import drain_outbox, purge_processed_events
+        from app.services.scheduler import run_every
+
+        try:
+            async with async_session_maker() as db:
+                handled = await drain_outbox(db)
+            print(f"Outbox drained: {handled} event(s) handled.")
+            if not args.once:
+                await asyncio.gather(
+                    run_every(settings.OUTBOX_POLL_SECONDS, drain_outbox),
+                    run_every(settings.OUTBOX_PURGE_SECONDS, purge_processed_events),
+                )
+        finally:
+            await engine.dispose()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
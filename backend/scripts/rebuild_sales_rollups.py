@@ -0,0 +1,34 @@
+"""
+Recompute the daily sales rollups (admin reports) from every order.
+
+The API folds new orders in every SALES_ROLLUP_REFRESH_SECONDS; run this after
+deleting or editing orders by hand, or to check the rollups from scratch.
+
+Run from backend/:
+  python scripts/rebuild_sales_rollups.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend root to path so "app" is found when running: python scripts/rebuild_sales_rollups.py
+_backend_root = Path(__file__).resolve().parent.parent
+if str(_backend_root) not in sys.path:
+    sys.path.insert(0, str(_backend_root))
+
+
+def main() -> None:
+    async def run() -> None:
+        from app.database import async_session_maker
+        from app.services.sales_rollups import rebuild_sales_rollups
+
+        async with async_session_maker() as db:
+            orders = await rebuild_sales_rollups(db)
+        print(f"Sales rollups rebuilt: {orders} order(s) folded in.")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Recompute the denormalized category product counters from the product table.
+
+Admin writes keep category.product_count / subtree_product_count current; run this
+after bulk imports or manual SQL on product/category, or to check for drift.
+
+Run from backend/:
+  python scripts/reconcile_category_counts.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend root to path so "app" is found when running: python scripts/reconcile_category_counts.py
+_backend_root = Path(__file__).resolve().parent.parent
+if str(_backend_root) not in sys.path:
+    sys.path.insert(0, str(_backend_root))
+
+
+def main() -> None:
+    async def run() -> None:
+        from app.database import async_session_maker
+        from app.services.catalog_cache import invalidate_categories
+        from app.services.category_counts import recompute_category_counts
+
+        async with async_session_maker() as db:
+            corrected = await recompute_category_counts(db)
+            await db.commit()
+        invalidate_categories()
+        print(f"Category counters reconciled: {corrected} row(s) corrected.")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()